@@ -1,62 +1,445 @@
+import os
+import zlib
 import sqlite3
 import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Iterable, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Page cache size in KiB (a negative cache_size is read as KiB by SQLite)
+CACHE_SIZE_KB = 8192
+
+# Prepared statements kept per connection by the sqlite3 module
+CACHED_STATEMENTS = 64
+
+# Milliseconds a writer waits on a lock held by another process
+BUSY_TIMEOUT_MS = 5000
+
+# Seconds a claimed event stays reserved for its worker before it can be
+# claimed again (e.g. after the worker crashed mid-send)
+DEFAULT_LEASE_SECONDS = 300
+
+# Synced events older than this many days move to archived_events
+RETENTION_DAYS = 30
+
+# Rows archived per transaction, so the UI thread is never blocked for long
+ARCHIVE_BATCH_SIZE = 500
+
+# Free pages returned to the filesystem per incremental vacuum step
+VACUUM_PAGES = 1000
+
+# Schema migrations; entry N upgrades a database from version N to N + 1.
+# Append new entries, never edit applied ones.
+MIGRATIONS: List[List[str]] = [
+    # 1: initial schema (matches databases created before versioning)
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS pending_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_type TEXT NOT NULL,
+            actor_username TEXT NOT NULL,
+            target_username TEXT NOT NULL,
+            details TEXT,
+            message_text TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            synced INTEGER DEFAULT 0,
+            pb_id TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS leads_cache (
+            username TEXT PRIMARY KEY,
+            status TEXT,
+            data TEXT,
+            updated_at TIMESTAMP
+        )
+        ''',
+    ],
+    # 2: the sync scan reads only unsynced rows, oldest first; the partial
+    # index holds just the backlog, so it stays small as history grows
+    [
+        '''
+        CREATE INDEX IF NOT EXISTS idx_pending_events_unsynced
+        ON pending_events (created_at) WHERE synced = 0
+        ''',
+    ],
+    # 3: lease expiry (unix time) of events claimed by a sync worker
+    [
+        'ALTER TABLE pending_events ADD COLUMN lease_until REAL',
+    ],
+    # 4: synced events past retention, one zlib-compressed JSON row each
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS archived_events (
+            id INTEGER PRIMARY KEY,
+            pb_id TEXT,
+            created_at TIMESTAMP,
+            data BLOB NOT NULL
+        )
+        ''',
+    ],
+    # 5: leads_cache mirrors the leads collection (updated_at holds the
+    # record's PocketBase `updated`); sync_state keeps pull watermarks
+    [
+        'ALTER TABLE leads_cache ADD COLUMN pb_id TEXT',
+        '''
+        CREATE TABLE IF NOT EXISTS sync_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        ''',
+    ],
+    # 6: Instagram actor registry, username -> PocketBase record id
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS actors_cache (
+            username TEXT PRIMARY KEY,
+            pb_id TEXT NOT NULL
+        )
+        ''',
+    ],
+]
+
+_INSERT_EVENT = '''
+    INSERT INTO pending_events (event_type, actor_username, target_username, details, message_text)
+    VALUES (?, ?, ?, ?, ?)
+'''
+_SELECT_PENDING = 'SELECT * FROM pending_events WHERE synced = 0 ORDER BY created_at ASC'
+_CLAIM_PENDING = '''
+    SELECT * FROM pending_events
+    WHERE synced = 0 AND (lease_until IS NULL OR lease_until <= ?)
+    ORDER BY created_at ASC
+    LIMIT ?
+'''
+_MARK_SYNCED = '''
+    UPDATE pending_events
+    SET synced = 1, pb_id = ?, lease_until = NULL
+    WHERE id = ?
+'''
+_SELECT_EXPIRED = '''
+    SELECT * FROM pending_events
+    WHERE synced = 1 AND created_at < datetime('now', ?)
+    LIMIT ?
+'''
+_ARCHIVE_EVENT = 'INSERT OR REPLACE INTO archived_events (id, pb_id, created_at, data) VALUES (?, ?, ?, ?)'
+_UPSERT_LEAD = '''
+    INSERT INTO leads_cache (username, pb_id, status, data, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (username) DO UPDATE SET
+        pb_id = excluded.pb_id,
+        status = excluded.status,
+        data = excluded.data,
+        updated_at = excluded.updated_at
+    WHERE excluded.pb_id IS NOT leads_cache.pb_id
+        OR excluded.updated_at >= COALESCE(leads_cache.updated_at, '')
+'''
+_RELEASE_EVENT = 'UPDATE pending_events SET lease_until = NULL WHERE id = ? AND synced = 0'
 
 class LocalDB:
     def __init__(self, db_path: str = "local_data.db"):
         self.db_path = db_path
-        self._init_db()
-
-    def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            # Events queue
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS pending_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    event_type TEXT NOT NULL,
-                    actor_username TEXT NOT NULL,
-                    target_username TEXT NOT NULL,
-                    details TEXT,
-                    message_text TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    synced INTEGER DEFAULT 0,
-                    pb_id TEXT
-                )
-            ''')
-            # Local leads cache
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS leads_cache (
-                    username TEXT PRIMARY KEY,
-                    status TEXT,
-                    data TEXT,
-                    updated_at TIMESTAMP
+        # One connection shared by the UI and sync threads under a lock
+        self._lock = threading.RLock()
+        # Set whenever events are queued, so the sync engine can wake up
+        self.events_added = threading.Event()
+        self._conn = self._connect()
+        self._migrate()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+            timeout=BUSY_TIMEOUT_MS / 1000
+        )
+        conn.row_factory = sqlite3.Row
+        # Must precede table creation; existing files are converted once by
+        # run_maintenance (see _enable_incremental_vacuum)
+        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        # WAL lets readers run alongside the writer; with synchronous=NORMAL
+        # a commit no longer fsyncs (only checkpoints do), and the database
+        # stays consistent after a crash.
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KB}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements on the shared connection; commits on success, rolls back on error."""
+        with self._lock:
+            with self._conn:
+                yield self._conn
+
+    def _migrate(self):
+        """Bring the schema up to date, one transaction per migration."""
+        with self._lock:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
-            conn.commit()
+            current = self._conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+            for version, statements in enumerate(MIGRATIONS[current:], start=current + 1):
+                with self._conn:
+                    # Explicit BEGIN: sqlite3 would otherwise run DDL outside the transaction
+                    self._conn.execute('BEGIN')
+                    for statement in statements:
+                        self._conn.execute(statement)
+                    self._conn.execute('INSERT INTO schema_version (version) VALUES (?)', (version,))
+
+    @property
+    def schema_version(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
 
     def add_event(self, event_type: str, actor: str, target: str, details: str, message: Optional[str] = None):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO pending_events (event_type, actor_username, target_username, details, message_text)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (event_type, actor, target, details, message))
-            return cursor.lastrowid
+        with self._transaction() as conn:
+            cursor = conn.execute(_INSERT_EVENT, (event_type, actor, target, details, message))
+        self.events_added.set()
+        return cursor.lastrowid
+
+    def add_events(self, rows: Iterable[Sequence[Optional[str]]]) -> int:
+        """
+        Insert many events in one transaction. Each row is
+        (event_type, actor, target, details[, message]), as for add_event.
+        Returns the number of rows inserted.
+        """
+        params = [(*row, None) if len(row) == 4 else tuple(row) for row in rows]
+        with self._transaction() as conn:
+            conn.executemany(_INSERT_EVENT, params)
+        if params:
+            self.events_added.set()
+        return len(params)
 
     def get_pending_events(self) -> List[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM pending_events WHERE synced = 0 ORDER BY created_at ASC')
-            return [dict(row) for row in cursor.fetchall()]
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(_SELECT_PENDING).fetchall()]
+
+    def claim_pending_events(self, limit: int = 100, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Iterator[Dict]:
+        """
+        Reserve up to `limit` of the oldest unsynced events for this worker.
+
+        The batch is leased for lease_seconds: other claims skip it until the
+        lease expires, so parallel workers (or processes) never get the same
+        event. Mark each event synced, or release it to retry sooner.
+        """
+        with self._lock:
+            now = time.time()
+            with self._conn:
+                # IMMEDIATE takes the write lock before the read, so no other
+                # process can claim the same rows in between
+                self._conn.execute('BEGIN IMMEDIATE')
+                rows = self._conn.execute(_CLAIM_PENDING, (now, limit)).fetchall()
+                lease_until = now + lease_seconds
+                self._conn.executemany(
+                    'UPDATE pending_events SET lease_until = ? WHERE id = ?',
+                    [(lease_until, row['id']) for row in rows]
+                )
+        # Rows were read before the update; report the lease just taken
+        return ({**dict(row), 'lease_until': lease_until} for row in rows)
+
+    def release_events(self, local_ids: Iterable[int]):
+        """Drop the lease on claimed events that were not synced."""
+        with self._transaction() as conn:
+            conn.executemany(_RELEASE_EVENT, [(local_id,) for local_id in local_ids])
 
     def mark_event_synced(self, local_id: int, pb_id: str):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE pending_events 
-                SET synced = 1, pb_id = ? 
-                WHERE id = ?
-            ''', (pb_id, local_id))
+        with self._transaction() as conn:
+            conn.execute(_MARK_SYNCED, (pb_id, local_id))
+
+    def mark_events_synced(self, pairs: Iterable[Tuple[int, str]]):
+        """Mark many events synced in one transaction; pairs are (local_id, pb_id)."""
+        with self._transaction() as conn:
+            conn.executemany(_MARK_SYNCED, [(pb_id, local_id) for local_id, pb_id in pairs])
+
+    def get_cached_lead(self, username: str) -> Optional[Dict]:
+        """The cached PocketBase lead record for a username, or None."""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM leads_cache WHERE username = ?', (username,)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def get_cached_leads(self, usernames: Iterable[str]) -> Dict[str, Dict]:
+        """Cached lead records for many usernames; returns username -> lead for those found."""
+        found = {}
+        usernames = list(dict.fromkeys(usernames))
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(usernames), 500):
+                chunk = usernames[i:i + 500]
+                rows = self._conn.execute(
+                    f'SELECT username, data FROM leads_cache WHERE username IN ({",".join("?" * len(chunk))})',
+                    chunk
+                ).fetchall()
+                found.update((row['username'], json.loads(row['data'])) for row in rows)
+        return found
+
+    def delete_cached_lead(self, username: str):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM leads_cache WHERE username = ?', (username,))
+
+    def prune_cached_leads(self, pb_ids: Iterable[str]) -> int:
+        """Drop cached leads whose PocketBase id is not in pb_ids; returns how many."""
+        keep = set(pb_ids)
+        with self._transaction() as conn:
+            stale = [(row['username'],) for row in conn.execute('SELECT username, pb_id FROM leads_cache')
+                     if row['pb_id'] not in keep]
+            conn.executemany('DELETE FROM leads_cache WHERE username = ?', stale)
+        return len(stale)
+
+    def upsert_cached_leads(self, leads: Iterable[Dict]) -> int:
+        """
+        Store PocketBase lead records, keyed by username. A copy of the same
+        record older than the cached one (by its `updated` timestamp) is
+        ignored.
+        """
+        params = [
+            (lead['username'], lead.get('id'), lead.get('status'), json.dumps(lead), lead.get('updated') or '')
+            for lead in leads if lead.get('username')
+        ]
+        with self._transaction() as conn:
+            conn.executemany(_UPSERT_LEAD, params)
+        return len(params)
+
+    def get_cached_actor_ids(self, usernames: Iterable[str]) -> Dict[str, str]:
+        """PocketBase ids of cached actors; returns username -> id for those found."""
+        found = {}
+        usernames = list(dict.fromkeys(usernames))
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(usernames), 500):
+                chunk = usernames[i:i + 500]
+                rows = self._conn.execute(
+                    f'SELECT username, pb_id FROM actors_cache WHERE username IN ({",".join("?" * len(chunk))})',
+                    chunk
+                ).fetchall()
+                found.update((row['username'], row['pb_id']) for row in rows)
+        return found
+
+    def cache_actors(self, actors: Iterable[Dict], replace: bool = False):
+        """Store actor records (username -> id); replace=True drops actors not listed."""
+        params = [(actor['username'], actor['id']) for actor in actors if actor.get('username')]
+        with self._transaction() as conn:
+            if replace:
+                conn.execute('DELETE FROM actors_cache')
+            conn.executemany('INSERT OR REPLACE INTO actors_cache (username, pb_id) VALUES (?, ?)', params)
+
+    def get_sync_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM sync_state WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_sync_state(self, key: str, value: Optional[str]):
+        with self._transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)', (key, value))
+
+    def archive_synced_events(self, older_than_days: float = RETENTION_DAYS) -> int:
+        """
+        Move synced events older than older_than_days out of pending_events
+        into archived_events, compressed. Runs in batches of
+        ARCHIVE_BATCH_SIZE; returns the number of events archived.
+        """
+        archived = 0
+        age = f'-{older_than_days} days'
+        while True:
+            with self._transaction() as conn:
+                rows = conn.execute(_SELECT_EXPIRED, (age, ARCHIVE_BATCH_SIZE)).fetchall()
+                if not rows:
+                    return archived
+                conn.executemany(_ARCHIVE_EVENT, [
+                    (row['id'], row['pb_id'], row['created_at'], zlib.compress(json.dumps(dict(row)).encode()))
+                    for row in rows
+                ])
+                conn.executemany('DELETE FROM pending_events WHERE id = ?', [(row['id'],) for row in rows])
+            archived += len(rows)
+
+    def iter_archived_events(self) -> Iterator[Dict]:
+        """Decompressed archived events, oldest first."""
+        with self._lock:
+            rows = self._conn.execute('SELECT data FROM archived_events ORDER BY created_at, id').fetchall()
+        return (json.loads(zlib.decompress(row['data'])) for row in rows)
+
+    def _enable_incremental_vacuum(self) -> bool:
+        """
+        Convert a file created before auto_vacuum was set; it needs one full
+        VACUUM (which rewrites the file and briefly needs twice its disk
+        space) before incremental vacuuming can release pages. Returns
+        whether a conversion ran.
+
+        The VACUUM runs on a connection of its own, outside the shared lock:
+        reads carry on, and writes such as add_event wait for it on SQLite's
+        busy timeout rather than on the lock.
+        """
+        with self._lock:
+            if self._conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+                return False
+        logger.info(f"Converting {self.db_path} to incremental auto-vacuum (one-time full VACUUM)")
+        started = time.monotonic()
+        conn = self._connect()
+        try:
+            conn.execute('VACUUM')
+        finally:
+            conn.close()
+        logger.info(f"Converted {self.db_path} in {time.monotonic() - started:.1f}s")
+        return True
+
+    def incremental_vacuum(self, pages: int = VACUUM_PAGES) -> int:
+        """Return up to `pages` free pages to the filesystem; returns the pages freed."""
+        with self._lock:
+            before = self._conn.execute('PRAGMA freelist_count').fetchone()[0]
+            # execute() steps the pragma once, which frees a single page;
+            # executescript runs it to completion
+            self._conn.executescript(f'PRAGMA incremental_vacuum({int(pages)});')
+            after = self._conn.execute('PRAGMA freelist_count').fetchone()[0]
+            # Fold the WAL back into the main file so it does not keep the old size
+            self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return before - after
+
+    def run_maintenance(self, older_than_days: float = RETENTION_DAYS) -> Dict:
+        """Archive expired events and vacuum; meant for idle time. Returns size_metrics()."""
+        self.archive_synced_events(older_than_days)
+        if not self._enable_incremental_vacuum():
+            self.incremental_vacuum()
+        return self.size_metrics()
+
+    def size_metrics(self) -> Dict:
+        """Database file sizes (bytes), page usage and row counts."""
+        with self._lock:
+            conn = self._conn
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+            page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+            freelist = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            counts = conn.execute('''
+                SELECT
+                    (SELECT COUNT(*) FROM pending_events WHERE synced = 0),
+                    (SELECT COUNT(*) FROM pending_events WHERE synced = 1),
+                    (SELECT COUNT(*) FROM archived_events),
+                    (SELECT COALESCE(SUM(LENGTH(data)), 0) FROM archived_events)
+            ''').fetchone()
+
+        def file_size(path: str) -> int:
+            return os.path.getsize(path) if os.path.exists(path) else 0
+
+        return {
+            'file_bytes': file_size(self.db_path),
+            'wal_bytes': file_size(self.db_path + '-wal'),
+            'page_size': page_size,
+            'page_count': page_count,
+            'free_pages': freelist,
+            'unsynced_events': counts[0],
+            'synced_events': counts[1],
+            'archived_events': counts[2],
+            'archived_bytes': counts[3],
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,13 +1,37 @@
 import os
+import time
 import logging
+import itertools
+import httpx
 from datetime import datetime
-from typing import Optional, Dict, Any
-from .pocketbase_client import CRMPocketBase, COLLECTIONS
+from typing import Optional, Dict, Any, List, Iterable
+from pocketbase_client import CRMPocketBase, COLLECTIONS, TTLCache, Metrics, F
+from .local_db import LocalDB
+
+# Leads fetched (and written to leads_cache) per page during a refresh
+LEADS_REFRESH_BATCH = 500
+
+# Seconds between reloads of the local actor registry
+ACTORS_REFRESH_INTERVAL = 600.0
+
+# Seconds between full id reconciles of leads_cache, which drop leads
+# deleted in PocketBase (delta pulls cannot see deletions)
+LEADS_RECONCILE_INTERVAL = 3600.0
 
 class PocketBaseSync:
-    def __init__(self):
-        self.pb = CRMPocketBase()
+    def __init__(self, local_db: Optional[LocalDB] = None):
+        # Local read model of the leads collection (see refresh_leads_cache)
+        self.local_db = local_db
+        # Leads and actors are looked up for every event; serve repeats from memory
+        self.pb = CRMPocketBase(cache=TTLCache(ttls={
+            COLLECTIONS['LEADS']: 300.0,
+            COLLECTIONS['INSTA_ACTORS']: 600.0,
+        }))
+        # Per-endpoint latency/traffic for the agent's PocketBase calls
+        self.metrics = Metrics().attach(self.pb)
         self.logger = logging.getLogger(__name__)
+        self.actors_refreshed_at: Optional[float] = None
+        self.leads_reconciled_at: Optional[float] = None
 
     def connect(self):
         email = os.getenv('PB_ADMIN_EMAIL')
@@ -21,76 +45,256 @@ class PocketBaseSync:
         else:
             self.logger.warning("No admin credentials found in environment")
 
+    def refresh_leads_cache(self) -> int:
+        """
+        Pull leads changed since the local cache's watermark into leads_cache.
+
+        The first refresh copies the whole collection; later ones fetch only
+        leads created or updated after the last ones pulled. Every
+        LEADS_RECONCILE_INTERVAL the cached ids are also checked against
+        the collection, dropping deleted leads. Returns the number of leads
+        received.
+        """
+        if self.local_db is None:
+            return 0
+        if not self.pb.is_authenticated:
+            self.connect()
+
+        if (self.leads_reconciled_at is None
+                or time.monotonic() - self.leads_reconciled_at >= LEADS_RECONCILE_INTERVAL):
+            ids = {lead['id'] for lead in self.pb.iter_leads(fields='id', sort='id')}
+            dropped = self.local_db.prune_cached_leads(ids)
+            if dropped:
+                self.logger.info(f"Dropped {dropped} deleted leads from the local cache")
+            self.leads_reconciled_at = time.monotonic()
+
+        # Two keyset cursors, kept in sync_state rather than derived from
+        # leads_cache (leads this agent writes are cached right away and must
+        # not move them past changes made elsewhere). `updated` is empty
+        # until a lead's first edit, so new leads are found by (created, id)
+        # and edits by (updated, id). Keysets rather than offsets, so a lead
+        # changed mid-refresh cannot shift later pages and get skipped.
+        return self._pull_leads('created') + self._pull_leads('updated')
+
+    def _pull_leads(self, field: str) -> int:
+        """Pull the leads after the stored (field, id) cursor into leads_cache."""
+        mark = self.local_db.get_sync_state(f'leads_{field}_mark') or ''
+        last_id = self.local_db.get_sync_state(f'leads_{field}_id') or ''
+        received = 0
+        while True:
+            # An empty mark is a position like any other: it sorts first
+            after = (F(field) > mark) | ((F(field) == mark) & (F.id > last_id))
+            if field == 'updated':
+                after = (F.updated != '') & after
+            page = list(itertools.islice(
+                self.pb.iter_leads(after, sort=f'{field},id', per_page=LEADS_REFRESH_BATCH),
+                LEADS_REFRESH_BATCH
+            ))
+            if not page:
+                return received
+            # The upsert keeps whichever copy has the newer `updated`
+            self.local_db.upsert_cached_leads(page)
+            mark, last_id = page[-1].get(field) or '', page[-1]['id']
+            self.local_db.set_sync_state(f'leads_{field}_mark', mark)
+            self.local_db.set_sync_state(f'leads_{field}_id', last_id)
+            received += len(page)
+            if len(page) < LEADS_REFRESH_BATCH:
+                return received
+
+    def find_lead(self, username: str) -> Optional[Dict[str, Any]]:
+        """Lead for a username, from leads_cache when possible, else PocketBase."""
+        if self.local_db is not None:
+            lead = self.local_db.get_cached_lead(username)
+            if lead:
+                return lead
+        return self.pb.find_lead_by_username(username)
+
+    def _forget_lead(self, username: str, lead_id: str):
+        """Drop a lead from leads_cache and the client's lookup cache."""
+        if self.local_db is not None:
+            self.local_db.delete_cached_lead(username)
+        if self.pb.cache is not None:
+            self.pb.cache.invalidate(COLLECTIONS['LEADS'], lead_id)
+
+    def refresh_actors_cache(self, force: bool = False) -> bool:
+        """
+        Reload the local actor registry (username -> id) if it is older than
+        ACTORS_REFRESH_INTERVAL. Every reload is a full one (insta_actors
+        has no `updated` field to poll by), which also drops deleted
+        actors. Returns whether a reload happened.
+        """
+        if self.local_db is None:
+            return False
+        if (not force and self.actors_refreshed_at is not None
+                and time.monotonic() - self.actors_refreshed_at < ACTORS_REFRESH_INTERVAL):
+            return False
+        if not self.pb.is_authenticated:
+            self.connect()
+
+        actors = list(self.pb.iter_actors(fields='id,username'))
+        self.local_db.cache_actors(actors, replace=True)
+        self.actors_refreshed_at = time.monotonic()
+        return True
+
+    def find_actor_ids(self, usernames: Iterable[str]) -> Dict[str, str]:
+        """Actor ids for usernames, from the local registry where possible."""
+        usernames = list(dict.fromkeys(usernames))
+        found = self.local_db.get_cached_actor_ids(usernames) if self.local_db is not None else {}
+        missing = [u for u in usernames if u not in found]
+        if missing:
+            actors = self.pb.find_actors_by_usernames(missing)
+            if self.local_db is not None:
+                self.local_db.cache_actors(actors.values())
+            found.update((username, actor['id']) for username, actor in actors.items())
+        return found
+
+    def touch_actors(self, usernames: Iterable[str]):
+        """Set last_activity to now for each actor, in one batch request."""
+        actor_ids = self.find_actor_ids(usernames)
+        if not actor_ids:
+            return
+        if not self.pb.is_authenticated:
+            self.connect()
+
+        now = datetime.utcnow().isoformat() + 'Z'
+        with self.pb.batch() as batch:
+            for actor_id in actor_ids.values():
+                batch.update(COLLECTIONS['INSTA_ACTORS'], actor_id, {
+                    'last_activity': now
+                })
+
+    def prefetch_lookups(self, events: List[Dict[str, Any]]):
+        """
+        Resolve the leads and actors of many pending events in bulk.
+
+        The results land in the client's lookup cache, so the per-event
+        lookups in log_outreach_event are answered without a request.
+        """
+        if not self.pb.is_authenticated:
+            self.connect()
+
+        usernames = [e['target_username'] for e in events]
+        if self.local_db is not None:
+            cached = self.local_db.get_cached_leads(usernames)
+            usernames = [u for u in usernames if u not in cached]
+
+        try:
+            if usernames:
+                self.pb.find_leads_by_usernames(usernames)
+            self.find_actor_ids([e['actor_username'] for e in events])
+        except Exception as e:
+            self.logger.warning(f"Bulk lookup failed, falling back to per-event lookups: {e}")
+
     def log_outreach_event(self, 
                            actor_username: str, 
                            target_username: str, 
                            event_type: str, 
                            details: str, 
-                           message_text: Optional[str] = None):
+                           message_text: Optional[str] = None,
+                           touch_actor: bool = True):
         """
         Log an outreach event to PocketBase.
         1. Find/Create Lead (target)
         2. Find Actor (source)
         3. Create Event Log
         4. Create Outreach Log (if message)
+
+        The lead and actor are looked up first; all writes are then sent
+        together as a single batch request. With touch_actor=False the
+        actor's last_activity is left alone, for callers that update it
+        once per batch of events (see touch_actors).
         """
         if not self.pb.is_authenticated:
             self.connect()
 
         try:
+            now = datetime.utcnow().isoformat() + 'Z'
+            lead = self.find_lead(target_username)
+
+            # Find Actor (source)
+            actor_id = None
+            try:
+                actor_id = self.find_actor_ids([actor_username]).get(actor_username)
+            except Exception as e:
+                self.logger.error(f"Error finding actor {actor_username}: {e}")
+
+            try:
+                return self._send_event(lead, actor_id, target_username, event_type,
+                                        details, message_text, touch_actor, now)
+            except httpx.HTTPStatusError as e:
+                if not lead or e.response.status_code not in (400, 404):
+                    raise
+                # The cached lead may have been deleted in PocketBase; look it
+                # up afresh and, if it is really gone, create it again
+                self._forget_lead(target_username, lead['id'])
+                current = self.pb.find_lead_by_username(target_username)
+                if current is not None and current['id'] == lead['id']:
+                    raise
+                self.logger.warning(f"Lead {target_username} ({lead['id']}) no longer exists, retrying")
+                return self._send_event(current, actor_id, target_username, event_type,
+                                        details, message_text, touch_actor, now)
+
+        except Exception as e:
+            self.logger.error(f"Error logging outreach event: {e}")
+            raise e
+
+    def _send_event(self,
+                    lead: Optional[Dict[str, Any]],
+                    actor_id: Optional[str],
+                    target_username: str,
+                    event_type: str,
+                    details: str,
+                    message_text: Optional[str],
+                    touch_actor: bool,
+                    now: str):
+        """Send the writes of one outreach event as a single batch request."""
+        # Runs on a SyncEngine worker: without /api/batch, send the requests
+        # one at a time so SYNC_WORKERS stays the cap on requests in flight
+        with self.pb.batch(workers=1) as batch:
             # 1. Handle Lead
-            lead = self.pb.find_lead_by_username(target_username)
             if not lead:
-                lead = self.pb.create_lead({
+                lead_id = batch.create(COLLECTIONS['LEADS'], {
                     'username': target_username,
                     'status': 'Cold No Reply',
                     'source': 'instagram',
-                    'first_contacted': datetime.utcnow().isoformat() + 'Z',
-                    'last_updated': datetime.utcnow().isoformat() + 'Z'
+                    'first_contacted': now,
+                    'last_updated': now
                 })
             else:
-                self.pb.update_lead(lead['id'], {
-                     'last_updated': datetime.utcnow().isoformat() + 'Z'
+                lead_id = lead['id']
+                batch.update(COLLECTIONS['LEADS'], lead_id, {
+                    'last_updated': now
                 })
 
             # 2. Handle Actor
-            actor_id = None
-            try:
-                 # Direct API call since client doesn't have specific actor methods yet
-                 result = self.pb._get(f'/collections/{COLLECTIONS["INSTA_ACTORS"]}/records', {
-                    'filter': f'username = "{actor_username}"'
+            if actor_id and touch_actor:
+                batch.update(COLLECTIONS['INSTA_ACTORS'], actor_id, {
+                    'last_activity': now
                 })
-                 if result.get('items'):
-                     actor_id = result['items'][0]['id']
-                     # Update actor activity
-                     self.pb._patch(f'/collections/{COLLECTIONS["INSTA_ACTORS"]}/records/{actor_id}', {
-                         'last_activity': datetime.utcnow().isoformat() + 'Z'
-                     })
-            except Exception as e:
-                self.logger.error(f"Error finding/updating actor {actor_username}: {e}")
 
             # 3. Create Event Log
             event_data = {
                 'event_type': event_type,
                 'details': details,
                 'source': 'instagram',
-                'target': lead['id']
+                'target': lead_id
             }
             if actor_id:
                 event_data['actor'] = actor_id
-            
-            event = self.pb.create_event_log(event_data)
+
+            event_index = len(batch)
+            event_id = batch.create(COLLECTIONS['EVENT_LOGS'], event_data)
 
             # 4. Create Outreach Log
             if message_text:
-                self.pb.create_outreach_log({
-                    'event': event['id'],
+                batch.create(COLLECTIONS['OUTREACH_LOGS'], {
+                    'event': event_id,
                     'message_text': message_text,
-                    'sent_at': datetime.utcnow().isoformat() + 'Z'
+                    'sent_at': now
                 })
-                
-            return event
 
-        except Exception as e:
-            self.logger.error(f"Error logging outreach event: {e}")
-            raise e
+        # The lead create/update is the first request; keep the cache current
+        if self.local_db is not None:
+            self.local_db.upsert_cached_leads([batch.results[0]])
+
+        return batch.results[event_index]
@@ -1,64 +1,233 @@
 import time
 import threading
 import logging
-from typing import Optional
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Set, Tuple
 from .local_db import LocalDB
 from .pocketbase_sync import PocketBaseSync
 
+# Pending events claimed (and held in memory) per batch
+SYNC_BATCH_SIZE = 100
+
+# Concurrent uploads; also the cap on requests in flight, since each worker
+# sends one at a time (event batches fall back to sequential requests)
+SYNC_WORKERS = 8
+
+# Seconds between LocalDB retention/vacuum runs on the idle sync thread
+MAINTENANCE_INTERVAL = 3600
+
+# After a wake-up, wait this long so events logged in quick succession
+# go out in one pass
+SYNC_DEBOUNCE = 0.5
+
+# Idle passes (lease expiry, cache refresh) start this many seconds apart
+# and double while the queue stays empty, up to SYNC_MAX_IDLE
+SYNC_IDLE_INTERVAL = 60.0
+SYNC_MAX_IDLE = 600.0
+
+# Retry delay after a failing pass, doubling up to SYNC_MAX_BACKOFF
+SYNC_RETRY_DELAY = 5.0
+SYNC_MAX_BACKOFF = 300.0
+
+
+def _is_server_failure(error: BaseException) -> bool:
+    """Whether an error means PocketBase is unreachable or unhealthy, rather than rejecting one record."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status in (401, 403, 408, 429)
+    return isinstance(error, httpx.TransportError)
+
+
 class SyncEngine:
-    def __init__(self, db_path: str = "local_data.db"):
+    def __init__(self, db_path: str = "local_data.db", workers: int = SYNC_WORKERS):
         self.local_db = LocalDB(db_path)
-        self.pb_sync = PocketBaseSync()
+        self.workers = workers
+        self.pb_sync = PocketBaseSync(self.local_db)
         self.logger = logging.getLogger(__name__)
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        self.last_maintenance = 0.0
+        self._stopping = threading.Event()
 
     def start(self):
         self.running = True
+        self._stopping.clear()
         self.thread = threading.Thread(target=self._run_loop, daemon=True)
         self.thread.start()
         self.logger.info("Sync engine started")
 
     def stop(self):
         self.running = False
+        self._stopping.set()
+        self.local_db.events_added.set()
         if self.thread:
             self.thread.join()
         self.logger.info("Sync engine stopped")
 
     def _run_loop(self):
+        wake = self.local_db.events_added
+        empty_passes = 0
+        failures = 0
         while self.running:
+            # Cleared before the pass: events queued during it wake the next wait
+            wake.clear()
             try:
-                self.sync_events()
+                synced, failed, server_failed = self.sync_events()
+                # Events PocketBase rejected are retried next pass; only a
+                # failing server slows the engine down
+                failures = failures + 1 if server_failed else 0
+                empty_passes = 0 if synced or failed else empty_passes + 1
             except Exception as e:
                 self.logger.error(f"Sync error: {e}")
-            
-            # Sleep in intervals to allow quick stop
-            for _ in range(60): 
-                if not self.running:
-                    break
-                time.sleep(1)
+                failures += 1
+
+            if time.monotonic() - self.last_maintenance >= MAINTENANCE_INTERVAL:
+                self.run_maintenance()
+
+            if failures:
+                # New events do not cut the backoff short; they go out with
+                # the next attempt
+                self._stopping.wait(min(SYNC_MAX_BACKOFF, SYNC_RETRY_DELAY * 2 ** min(failures - 1, 16)))
+                continue
+            timeout = min(SYNC_MAX_IDLE, SYNC_IDLE_INTERVAL * 2 ** min(empty_passes, 16))
+            if wake.wait(timeout) and self.running:
+                self._stopping.wait(SYNC_DEBOUNCE)
+
+    def run_maintenance(self):
+        """Archive old synced events and shrink the local database file."""
+        self.last_maintenance = time.monotonic()
+        try:
+            sizes = self.local_db.run_maintenance()
+            self.logger.info(
+                f"Local DB: {sizes['file_bytes']} bytes, {sizes['unsynced_events']} unsynced, "
+                f"{sizes['synced_events']} synced, {sizes['archived_events']} archived events"
+            )
+        except Exception as e:
+            self.logger.error(f"Local DB maintenance error: {e}")
 
     def sync_events(self):
-        events = self.local_db.get_pending_events()
-        if not events:
-            return
+        """
+        Upload all pending events.
+
+        Returns (events synced, events failed, server_failed); server_failed
+        is True if PocketBase was unreachable or answered with a server,
+        auth or rate-limit error, as opposed to rejecting single events.
+        """
+        server_failed = False
+        # Keep the local leads read model current; lookups fall back to
+        # PocketBase (or the stale cache) if this fails
+        try:
+            self.pb_sync.refresh_leads_cache()
+            self.pb_sync.refresh_actors_cache()
+        except Exception as e:
+            self.logger.warning(f"Local cache refresh failed: {e}")
+            server_failed = _is_server_failure(e)
+
+        # Drain the queue a batch at a time; failed events keep their lease
+        # until the pass ends so the same pass does not claim them again.
+        # Once the server is failing, stop claiming and leave the rest to the
+        # next pass, after the backoff
+        failed = []
+        claimed = 0
+        # Targets with a failed event: their later events wait for the next
+        # pass, so each target's events still reach PocketBase in order
+        blocked: Set[str] = set()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='sync') as pool:
+                while not server_failed:
+                    events = list(self.local_db.claim_pending_events(SYNC_BATCH_SIZE))
+                    if not events:
+                        break
+                    claimed += len(events)
+                    self.logger.info(f"Claimed {len(events)} pending events to sync")
+                    try:
+                        batch_failed, batch_server_failed = self._sync_batch(events, pool, blocked)
+                        failed.extend(batch_failed)
+                        server_failed = server_failed or batch_server_failed
+                    except Exception:
+                        failed.extend(event['id'] for event in events)
+                        raise
+        finally:
+            if failed:
+                self.local_db.release_events(failed)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"PocketBase metrics: {self.pb_sync.metrics.to_json()}")
+
+        return claimed - len(failed), len(failed), server_failed
+
+    def _sync_batch(self, events, pool: ThreadPoolExecutor, blocked: Set[str]):
+        """
+        Upload one claimed batch; returns (local IDs that failed, whether
+        any failure was a server failure).
+
+        Events are grouped by target username; groups are uploaded
+        concurrently on the pool, the events of a group one after another.
+        """
+        failed = []
+        synced = []
+        server_failed = False
 
-        self.logger.info(f"Found {len(events)} pending events to sync")
-        
         # Ensure connection
         if not self.pb_sync.pb.is_authenticated:
             self.pb_sync.connect()
 
+        # Resolve every lead/actor up front in a few bulk reads
+        self.pb_sync.prefetch_lookups(events)
+
+        groups: Dict[str, List[Dict]] = {}
         for event in events:
+            if event['target_username'] in blocked:
+                failed.append(event['id'])
+            else:
+                groups.setdefault(event['target_username'], []).append(event)
+
+        futures = {target: pool.submit(self._upload_group, group) for target, group in groups.items()}
+        try:
+            for target, future in futures.items():
+                group_synced, group_failed, group_server_failed = future.result()
+                synced.extend(group_synced)
+                server_failed = server_failed or group_server_failed
+                if group_failed:
+                    failed.extend(group_failed)
+                    blocked.add(target)
+        finally:
+            # One local commit per batch, even if the batch is interrupted
+            if synced:
+                self.local_db.mark_events_synced(synced)
+
+        # One last_activity update per actor for the whole batch
+        synced_ids = {local_id for local_id, _ in synced}
+        active = {event['actor_username'] for event in events if event['id'] in synced_ids}
+        if active:
+            try:
+                self.pb_sync.touch_actors(active)
+            except Exception as e:
+                self.logger.warning(f"Failed to update actor activity: {e}")
+
+        return failed, server_failed
+
+    def _upload_group(self, events: List[Dict]) -> Tuple[List[Tuple[int, str]], List[int], bool]:
+        """
+        Upload one target's events in order, stopping at the first failure.
+        Returns (synced (local_id, pb_id) pairs, failed local IDs, whether
+        the failure was a server failure).
+        """
+        synced = []
+        for i, event in enumerate(events):
             try:
                 pb_event = self.pb_sync.log_outreach_event(
                     actor_username=event['actor_username'],
                     target_username=event['target_username'],
                     event_type=event['event_type'],
                     details=event['details'],
-                    message_text=event['message_text']
+                    message_text=event['message_text'],
+                    touch_actor=False
                 )
-                self.local_db.mark_event_synced(event['id'], pb_event['id'])
+                synced.append((event['id'], pb_event['id']))
                 self.logger.info(f"Synced event {event['id']}")
             except Exception as e:
                 self.logger.error(f"Failed to sync event {event['id']}: {e}")
+                return synced, [rest['id'] for rest in events[i:]], _is_server_failure(e)
+        return synced, [], False
@@ -0,0 +1,156 @@
+"""
+CRM-Tableturnerr PocketBase Python Client
+
+Shared SDK wrapper for Python applications (transcriber, insta-outreach-agent).
+Uses httpx for HTTP requests to PocketBase API.
+
+Submodules are imported on first use of one of their names, so importing the
+package is cheap and e.g. asyncio is only loaded by code that uses
+AsyncCRMPocketBase:
+
+    from pocketbase_client import CRMPocketBase, COLLECTIONS, F
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    # types
+    'User': 'types',
+    'Company': 'types',
+    'ColdCallExpand': 'types',
+    'ColdCall': 'types',
+    'CallTranscriptExpand': 'types',
+    'CallTranscript': 'types',
+    'Lead': 'types',
+    'InstaActorExpand': 'types',
+    'InstaActor': 'types',
+    'EventLogExpand': 'types',
+    'EventLog': 'types',
+    'OutreachLogExpand': 'types',
+    'OutreachLog': 'types',
+    'AssignmentExpand': 'types',
+    'Goal': 'types',
+    'Rule': 'types',
+    'ColdCallStruct': 'types',
+    'LeadStruct': 'types',
+    'EventLogStruct': 'types',
+    'COLLECTIONS': 'types',
+    # codec
+    'JSON_BACKENDS': 'codec',
+    'available_backends': 'codec',
+    'struct_fields': 'codec',
+    'to_struct': 'codec',
+    'JSONDecoder': 'codec',
+    'DEFAULT_DECODER': 'codec',
+    # filters
+    'Param': 'filters',
+    'quote_value': 'filters',
+    'Expr': 'filters',
+    'PreparedFilter': 'filters',
+    'Field': 'filters',
+    'F': 'filters',
+    'FilterLike': 'filters',
+    # metrics
+    'DEFAULT_LATENCY_BUCKETS': 'metrics',
+    'RequestEvent': 'metrics',
+    'PreRequestHook': 'metrics',
+    'PostRequestHook': 'metrics',
+    'endpoint_label': 'metrics',
+    'Metrics': 'metrics',
+    # polling
+    'DEFAULT_RESYNC_INTERVAL': 'polling',
+    'DELTA_OVERLAP': 'polling',
+    'DeltaQuery': 'polling',
+    # query
+    'DEFAULT_PER_PAGE': 'query',
+    'FieldSpec': 'query',
+    'MAX_FILTER_LENGTH': 'query',
+    # pool
+    'DEFAULT_TIMEOUT': 'pool',
+    'DEFAULT_MAX_CONNECTIONS': 'pool',
+    'DEFAULT_MAX_KEEPALIVE_CONNECTIONS': 'pool',
+    'DEFAULT_KEEPALIVE_EXPIRY': 'pool',
+    'shared_http_client': 'pool',
+    'close_shared_clients': 'pool',
+    # cache
+    'DEFAULT_CACHE_SIZE': 'cache',
+    'DEFAULT_CACHE_TTL': 'cache',
+    'TTLCache': 'cache',
+    # ratelimit
+    'DEFAULT_RATE_LIMITS': 'ratelimit',
+    'RATE_LIMIT_BACKOFF': 'ratelimit',
+    'RATE_LIMIT_PENALTY': 'ratelimit',
+    'RATE_LIMIT_RECOVERY': 'ratelimit',
+    'TokenBucket': 'ratelimit',
+    'RateLimiter': 'ratelimit',
+    # retry
+    'TOKEN_REFRESH_MARGIN': 'retry',
+    'RetryPolicy': 'retry',
+    'DEFAULT_RETRY': 'retry',
+    # batch
+    'BATCH_MAX_REQUESTS': 'batch',
+    'BATCH_PIPELINE_WORKERS': 'batch',
+    'generate_record_id': 'batch',
+    'Batch': 'batch',
+    # realtime
+    'REALTIME_MAX_BACKOFF': 'realtime',
+    'REALTIME_CONNECT_TIMEOUT': 'realtime',
+    'Subscription': 'realtime',
+    'Realtime': 'realtime',
+    # clients
+    'COUNT_WORKERS': 'client',
+    'CRMPocketBase': 'client',
+    'create_client': 'client',
+    'DEFAULT_MAX_CONCURRENCY': 'async_client',
+    'AsyncCRMPocketBase': 'async_client',
+    'create_async_client': 'async_client',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .types import (
+        User, Company, ColdCallExpand, ColdCall, CallTranscriptExpand, CallTranscript,
+        Lead, InstaActorExpand, InstaActor, EventLogExpand, EventLog,
+        OutreachLogExpand, OutreachLog, AssignmentExpand, Goal, Rule,
+        ColdCallStruct, LeadStruct, EventLogStruct, COLLECTIONS,
+    )
+    from .codec import (
+        JSON_BACKENDS, available_backends, struct_fields, to_struct, JSONDecoder, DEFAULT_DECODER,
+    )
+    from .filters import Param, quote_value, Expr, PreparedFilter, Field, F, FilterLike
+    from .metrics import (
+        DEFAULT_LATENCY_BUCKETS, RequestEvent, PreRequestHook, PostRequestHook, endpoint_label, Metrics,
+    )
+    from .polling import DEFAULT_RESYNC_INTERVAL, DELTA_OVERLAP, DeltaQuery
+    from .query import DEFAULT_PER_PAGE, FieldSpec, MAX_FILTER_LENGTH
+    from .pool import (
+        DEFAULT_TIMEOUT, DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        DEFAULT_KEEPALIVE_EXPIRY, shared_http_client, close_shared_clients,
+    )
+    from .cache import DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL, TTLCache
+    from .ratelimit import (
+        DEFAULT_RATE_LIMITS, RATE_LIMIT_BACKOFF, RATE_LIMIT_PENALTY, RATE_LIMIT_RECOVERY,
+        TokenBucket, RateLimiter,
+    )
+    from .retry import TOKEN_REFRESH_MARGIN, RetryPolicy, DEFAULT_RETRY
+    from .batch import BATCH_MAX_REQUESTS, BATCH_PIPELINE_WORKERS, generate_record_id, Batch
+    from .realtime import REALTIME_MAX_BACKOFF, REALTIME_CONNECT_TIMEOUT, Subscription, Realtime
+    from .client import COUNT_WORKERS, CRMPocketBase, create_client
+    from .async_client import DEFAULT_MAX_CONCURRENCY, AsyncCRMPocketBase, create_async_client
@@ -0,0 +1,932 @@
+"""
+Async PocketBase client (httpx.AsyncClient).
+"""
+
+import os
+import time
+import asyncio
+from typing import Optional, Dict, List, Any, AsyncIterator, Awaitable, Callable, Sequence, Tuple, Union
+from datetime import datetime
+
+import httpx
+
+from .types import (
+    User, Company, ColdCall, CallTranscript, Lead, InstaActor,
+    EventLog, OutreachLog, Goal, Rule, COLLECTIONS,
+    ColdCallStruct, LeadStruct, EventLogStruct,
+)
+from .filters import F, Expr, FilterLike
+from .query import (
+    DEFAULT_PER_PAGE, FieldSpec, _query_params, _chunk_filters,
+    _match_lookup, _lookup_key,
+)
+from .pool import DEFAULT_TIMEOUT, DEFAULT_KEEPALIVE_EXPIRY, _http_client_options
+from .cache import TTLCache, _invalidate_cache
+from .codec import DEFAULT_DECODER, JSONDecoder, struct_fields
+from .metrics import PreRequestHook, PostRequestHook, _request_event, _call_hooks
+from .polling import DeltaQuery, _delta_key
+from .ratelimit import RateLimiter
+from .retry import (
+    TOKEN_REFRESH_MARGIN, RetryPolicy, DEFAULT_RETRY,
+    _token_expires_at, _is_auth_endpoint,
+)
+from .batch import BATCH_MAX_REQUESTS, Batch, _batch_refs
+
+
+# Default number of requests an AsyncCRMPocketBase keeps in flight at once
+DEFAULT_MAX_CONCURRENCY = 20
+
+
+class AsyncCRMPocketBase:
+    """
+    Asyncio PocketBase client for CRM-Tableturnerr Python applications.
+
+    Mirrors CRMPocketBase method for method, except realtime subscriptions
+    (use CRMPocketBase.subscribe(), which runs on its own thread). All
+    requests go through one pooled httpx.AsyncClient and a semaphore that
+    caps how many are in flight, so callers can asyncio.gather() dozens of
+    writes without opening a connection per request. timeout,
+    keepalive_expiry, http2, cache, retry, decoder, rate_limiter and the
+    request hooks work as on CRMPocketBase.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        cache: Optional[TTLCache] = None,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+        decoder: Optional[JSONDecoder] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        self.url = url or os.getenv('POCKETBASE_URL', 'http://localhost:8090')
+        self.token: Optional[str] = None
+        self.user: Optional[User] = None
+        self.max_concurrency = max_concurrency
+        # The pool is sized to the concurrency cap so no request waits on it
+        self._client = httpx.AsyncClient(**_http_client_options(
+            timeout=timeout,
+            max_connections=max_concurrency,
+            max_keepalive_connections=max_concurrency,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2
+        ))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.cache = cache
+        self.retry = retry
+        self.decoder = decoder or DEFAULT_DECODER
+        self.rate_limiter = rate_limiter
+        self.pre_request_hooks: List[PreRequestHook] = []
+        self.post_request_hooks: List[PostRequestHook] = []
+        self._reauthenticate: Optional[Callable[[], Awaitable[Any]]] = None
+        self._auth_lock: Optional[asyncio.Lock] = None
+        self._batch_supported: Optional[bool] = None
+        self._delta_queries: Dict[tuple, DeltaQuery] = {}
+
+    def _headers(self) -> Dict[str, str]:
+        """Get request headers with auth token if available."""
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = self.token
+        return headers
+
+    async def _request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Send a request once a concurrency slot is free, retrying transient
+        failures and renewing the token like CRMPocketBase._request.
+        """
+        if self._semaphore is None:
+            # Created lazily so they bind to the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._auth_lock = asyncio.Lock()
+        body = kwargs.get('json')
+        if not _is_auth_endpoint(endpoint):
+            await self._refresh_expiring_token()
+        attempt = 0
+        sent = 0
+        reauthenticated = False
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(method, endpoint)
+            token = self.token
+            response = error = None
+            headers = self._headers()
+            _call_hooks(self.pre_request_hooks, method, endpoint, headers)
+            try:
+                async with self._semaphore:
+                    # Timed inside the slot so queueing is not counted as latency
+                    started = time.perf_counter()
+                    response = await self._client.request(
+                        method,
+                        f"{self.url}/api{endpoint}",
+                        headers=headers,
+                        **kwargs
+                    )
+            except httpx.TransportError as e:
+                error = e
+            if self.post_request_hooks:
+                event = _request_event(method, endpoint, response, error, time.perf_counter() - started, sent)
+                _call_hooks(self.post_request_hooks, event)
+            if self.rate_limiter is not None:
+                self.rate_limiter.update(method, endpoint, response)
+            sent += 1
+            if (response is not None and response.status_code == 401 and not reauthenticated
+                    and self._reauthenticate and not _is_auth_endpoint(endpoint)):
+                reauthenticated = True
+                await self._renew_token(token)
+                continue
+            if response is not None and response.is_success:
+                return response
+            delay = self.retry.next_delay(attempt, method, endpoint, body, response, error) if self.retry else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+                return response
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _renew_token(self, stale_token: Optional[str]) -> None:
+        """Re-authenticate with the stored credentials, once per stale token."""
+        async with self._auth_lock:
+            if self.token == stale_token:
+                await self._reauthenticate()
+
+    async def _refresh_expiring_token(self) -> None:
+        """Renew a token that expires within TOKEN_REFRESH_MARGIN seconds."""
+        if self._reauthenticate is None:
+            return
+        expires_at = _token_expires_at(self.token)
+        if expires_at is not None and expires_at - time.time() < TOKEN_REFRESH_MARGIN:
+            await self._renew_token(self.token)
+
+    async def _get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        """Make GET request to PocketBase API."""
+        response = await self._request('GET', endpoint, params=params)
+        return self.decoder.decode(response.content)
+
+    async def _post(self, endpoint: str, data: Dict) -> Any:
+        """Make POST request to PocketBase API."""
+        response = await self._request('POST', endpoint, json=data)
+        result = self.decoder.decode(response.content)
+        _invalidate_cache(self.cache, endpoint, data, result)
+        return result
+
+    async def _patch(self, endpoint: str, data: Dict) -> Any:
+        """Make PATCH request to PocketBase API."""
+        response = await self._request('PATCH', endpoint, json=data)
+        result = self.decoder.decode(response.content)
+        _invalidate_cache(self.cache, endpoint, data, result)
+        return result
+
+    async def _delete(self, endpoint: str) -> bool:
+        """Make DELETE request to PocketBase API."""
+        await self._request('DELETE', endpoint)
+        _invalidate_cache(self.cache, endpoint)
+        return True
+
+    async def _cached_lookup(self, collection: str, key: Any, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Serve a lookup from the cache, awaiting fetch() on a miss."""
+        if self.cache is None:
+            return await fetch()
+        hit, value = self.cache.get(collection, key)
+        if hit:
+            return value
+        value = await fetch()
+        self.cache.set(collection, key, value)
+        return value
+
+    async def _iter_records(
+        self,
+        collection: str,
+        params: Optional[Dict] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        struct: Optional[type] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Stream every record of a collection, fetching pages lazily.
+
+        Same paging and struct rules as CRMPocketBase._iter_records; with
+        prefetch=True the next page is requested as a task while the current
+        one is consumed.
+        """
+        endpoint = f'/collections/{collection}/records'
+        base = dict(params or {})
+        base['perPage'] = per_page
+        base['skipTotal'] = 1
+        if struct is not None and 'fields' not in base:
+            base['fields'] = ','.join(struct_fields(struct))
+
+        async def fetch(page: int) -> List[Any]:
+            if struct is not None:
+                response = await self._request('GET', endpoint, params={**base, 'page': page})
+                return self.decoder.decode_items(response.content, struct)
+            result = await self._get(endpoint, {**base, 'page': page})
+            return result.get('items', [])
+
+        page = 1
+        pending = asyncio.ensure_future(fetch(page)) if prefetch else None
+        try:
+            while True:
+                items = await pending if pending is not None else await fetch(page)
+                page += 1
+                more = len(items) >= per_page
+                pending = asyncio.ensure_future(fetch(page)) if prefetch and more else None
+                for item in items:
+                    yield item
+                if not more:
+                    return
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    # -------------------------------------------------------------------------
+    # Authentication
+    # -------------------------------------------------------------------------
+
+    async def auth_as_admin(self, email: str, password: str) -> None:
+        """Authenticate as admin for server-side operations."""
+        result = await self._post('/admins/auth-with-password', {
+            'identity': email,
+            'password': password
+        })
+        self.token = result['token']
+        self._reauthenticate = lambda: self.auth_as_admin(email, password)
+
+    async def auth_with_password(self, email: str, password: str) -> User:
+        """Authenticate user with email/password."""
+        result = await self._post(f'/collections/{COLLECTIONS["USERS"]}/auth-with-password', {
+            'identity': email,
+            'password': password
+        })
+        self.token = result['token']
+        self.user = result['record']
+        self._reauthenticate = lambda: self.auth_with_password(email, password)
+        return self.user
+
+    def logout(self) -> None:
+        """Clear authentication."""
+        self.token = None
+        self.user = None
+        self._reauthenticate = None
+
+    @property
+    def is_authenticated(self) -> bool:
+        """Check if client is authenticated."""
+        return self.token is not None
+
+    # -------------------------------------------------------------------------
+    # Companies
+    # -------------------------------------------------------------------------
+
+    async def get_companies(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[Company]:
+        """Get all companies."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        result = await self._get(f'/collections/{COLLECTIONS["COMPANIES"]}/records', params)
+        return result.get('items', [])
+
+    def iter_companies(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> AsyncIterator[Company]:
+        """Iterate over all companies, page by page."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        return self._iter_records(COLLECTIONS["COMPANIES"], params, per_page, prefetch)
+
+    async def get_company(
+        self,
+        id: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Company:
+        """Get company by ID."""
+        params = _query_params(fields=fields, expand=expand)
+        return await self._get(f'/collections/{COLLECTIONS["COMPANIES"]}/records/{id}', params)
+
+    async def find_company_by_phone(
+        self,
+        phone: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Optional[Company]:
+        """Find company by phone number."""
+        params = _query_params(F.phone_numbers.contains(phone), fields=fields, expand=expand)
+        async def fetch():
+            result = await self._get(f'/collections/{COLLECTIONS["COMPANIES"]}/records', params)
+            items = result.get('items', [])
+            return items[0] if items else None
+        return await self._cached_lookup(COLLECTIONS["COMPANIES"], _lookup_key('phone_numbers', phone, params, '~'), fetch)
+
+    async def create_company(self, data: Dict) -> Company:
+        """Create new company."""
+        return await self._post(f'/collections/{COLLECTIONS["COMPANIES"]}/records', data)
+
+    async def update_company(self, id: str, data: Dict) -> Company:
+        """Update company."""
+        return await self._patch(f'/collections/{COLLECTIONS["COMPANIES"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Cold Calls
+    # -------------------------------------------------------------------------
+
+    async def get_cold_calls(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        sort: str = '-created',
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[ColdCall]:
+        """Get cold calls."""
+        params = _query_params(filter_str, sort, fields, expand)
+        result = await self._get(f'/collections/{COLLECTIONS["COLD_CALLS"]}/records', params)
+        return result.get('items', [])
+
+    def iter_cold_calls(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        sort: str = '-created',
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        struct: Optional[type] = None
+    ) -> AsyncIterator[Union[ColdCall, ColdCallStruct]]:
+        """
+        Iterate over all cold calls, page by page.
+
+        With struct (e.g. ColdCallStruct) records are decoded straight into
+        instances of it and only its fields are requested.
+        """
+        params = _query_params(filter_str, sort, fields, expand)
+        return self._iter_records(COLLECTIONS["COLD_CALLS"], params, per_page, prefetch, struct)
+
+    async def get_cold_call(
+        self,
+        id: str,
+        expand: Optional[FieldSpec] = None,
+        fields: Optional[FieldSpec] = None
+    ) -> ColdCall:
+        """Get cold call by ID."""
+        params = _query_params(fields=fields, expand=expand)
+        return await self._get(f'/collections/{COLLECTIONS["COLD_CALLS"]}/records/{id}', params)
+
+    async def create_cold_call(self, data: Dict) -> ColdCall:
+        """Create new cold call."""
+        return await self._post(f'/collections/{COLLECTIONS["COLD_CALLS"]}/records', data)
+
+    async def update_cold_call(self, id: str, data: Dict) -> ColdCall:
+        """Update cold call."""
+        return await self._patch(f'/collections/{COLLECTIONS["COLD_CALLS"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Call Transcripts
+    # -------------------------------------------------------------------------
+
+    async def get_transcript_for_call(
+        self,
+        call_id: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Optional[CallTranscript]:
+        """Get transcript for a specific call."""
+        params = _query_params(F.call == call_id, fields=fields, expand=expand)
+        result = await self._get(f'/collections/{COLLECTIONS["CALL_TRANSCRIPTS"]}/records', params)
+        items = result.get('items', [])
+        return items[0] if items else None
+
+    async def create_transcript(self, data: Dict) -> CallTranscript:
+        """Create new transcript."""
+        return await self._post(f'/collections/{COLLECTIONS["CALL_TRANSCRIPTS"]}/records', data)
+
+    # -------------------------------------------------------------------------
+    # Leads
+    # -------------------------------------------------------------------------
+
+    async def get_leads(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        sort: str = '-last_updated',
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[Lead]:
+        """Get leads."""
+        params = _query_params(filter_str, sort, fields, expand)
+        result = await self._get(f'/collections/{COLLECTIONS["LEADS"]}/records', params)
+        return result.get('items', [])
+
+    def iter_leads(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        sort: str = '-last_updated',
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        struct: Optional[type] = None
+    ) -> AsyncIterator[Union[Lead, LeadStruct]]:
+        """
+        Iterate over all leads, page by page.
+
+        With struct (e.g. LeadStruct) records are decoded straight into
+        instances of it and only its fields are requested.
+        """
+        params = _query_params(filter_str, sort, fields, expand)
+        return self._iter_records(COLLECTIONS["LEADS"], params, per_page, prefetch, struct)
+
+    async def find_lead_by_username(
+        self,
+        username: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Optional[Lead]:
+        """Find lead by username."""
+        params = _query_params(F.username == username, fields=fields, expand=expand)
+        async def fetch():
+            result = await self._get(f'/collections/{COLLECTIONS["LEADS"]}/records', params)
+            items = result.get('items', [])
+            return items[0] if items else None
+        return await self._cached_lookup(COLLECTIONS["LEADS"], _lookup_key('username', username, params), fetch)
+
+    async def create_lead(self, data: Dict) -> Lead:
+        """Create new lead."""
+        return await self._post(f'/collections/{COLLECTIONS["LEADS"]}/records', data)
+
+    async def update_lead(self, id: str, data: Dict) -> Lead:
+        """Update lead."""
+        return await self._patch(f'/collections/{COLLECTIONS["LEADS"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Insta Actors
+    # -------------------------------------------------------------------------
+
+    async def find_actor_by_username(
+        self,
+        username: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Optional[InstaActor]:
+        """Find Instagram actor by username."""
+        params = _query_params(F.username == username, fields=fields, expand=expand)
+        async def fetch():
+            result = await self._get(f'/collections/{COLLECTIONS["INSTA_ACTORS"]}/records', params)
+            items = result.get('items', [])
+            return items[0] if items else None
+        return await self._cached_lookup(COLLECTIONS["INSTA_ACTORS"], _lookup_key('username', username, params), fetch)
+
+    def iter_actors(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> AsyncIterator[InstaActor]:
+        """Iterate over all Instagram actors, page by page."""
+        params = _query_params(sort='username', fields=fields, expand=expand)
+        return self._iter_records(COLLECTIONS["INSTA_ACTORS"], params, per_page, prefetch)
+
+    async def update_actor(self, id: str, data: Dict) -> InstaActor:
+        """Update Instagram actor."""
+        return await self._patch(f'/collections/{COLLECTIONS["INSTA_ACTORS"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Event Logs
+    # -------------------------------------------------------------------------
+
+    async def get_event_logs(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        limit: int = 100,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        incremental: bool = False
+    ) -> List[EventLog]:
+        """
+        Get event logs, newest first.
+
+        With incremental=True repeated calls with the same arguments only
+        fetch logs changed since the previous call (see poll()).
+        """
+        if incremental:
+            return await self.poll(self.delta_query(COLLECTIONS["EVENT_LOGS"], filter_str, '-created', fields, expand, limit))
+        params = _query_params(filter_str, '-created', fields, expand)
+        params['perPage'] = limit
+        result = await self._get(f'/collections/{COLLECTIONS["EVENT_LOGS"]}/records', params)
+        return result.get('items', [])
+
+    def iter_event_logs(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        struct: Optional[type] = None
+    ) -> AsyncIterator[Union[EventLog, EventLogStruct]]:
+        """
+        Iterate over all event logs, newest first, page by page.
+
+        With struct (e.g. EventLogStruct) records are decoded straight into
+        instances of it and only its fields are requested.
+        """
+        params = _query_params(filter_str, '-created', fields, expand)
+        return self._iter_records(COLLECTIONS["EVENT_LOGS"], params, per_page, prefetch, struct)
+
+    async def create_event_log(self, data: Dict) -> EventLog:
+        """Create new event log."""
+        return await self._post(f'/collections/{COLLECTIONS["EVENT_LOGS"]}/records', data)
+
+    # -------------------------------------------------------------------------
+    # Outreach Logs
+    # -------------------------------------------------------------------------
+
+    async def create_outreach_log(self, data: Dict) -> OutreachLog:
+        """Create new outreach log."""
+        return await self._post(f'/collections/{COLLECTIONS["OUTREACH_LOGS"]}/records', data)
+
+    # -------------------------------------------------------------------------
+    # Goals
+    # -------------------------------------------------------------------------
+
+    async def get_goals(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[Goal]:
+        """Get goals."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        result = await self._get(f'/collections/{COLLECTIONS["GOALS"]}/records', params)
+        return result.get('items', [])
+
+    def iter_goals(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> AsyncIterator[Goal]:
+        """Iterate over all goals, page by page."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        return self._iter_records(COLLECTIONS["GOALS"], params, per_page, prefetch)
+
+    async def get_active_goals(
+        self,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        incremental: bool = False
+    ) -> List[Goal]:
+        """
+        Get active goals.
+
+        With incremental=True repeated calls only fetch goals changed since
+        the previous call (see poll()).
+        """
+        if incremental:
+            return await self.poll(self.delta_query(COLLECTIONS["GOALS"], F.status == 'Active', fields=fields, expand=expand))
+        return await self.get_goals(F.status == 'Active', fields, expand)
+
+    async def create_goal(self, data: Dict) -> Goal:
+        """Create new goal."""
+        return await self._post(f'/collections/{COLLECTIONS["GOALS"]}/records', data)
+
+    async def update_goal(self, id: str, data: Dict) -> Goal:
+        """Update goal."""
+        return await self._patch(f'/collections/{COLLECTIONS["GOALS"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Rules
+    # -------------------------------------------------------------------------
+
+    async def get_rules(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[Rule]:
+        """Get rules."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        result = await self._get(f'/collections/{COLLECTIONS["RULES"]}/records', params)
+        return result.get('items', [])
+
+    def iter_rules(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> AsyncIterator[Rule]:
+        """Iterate over all rules, page by page."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        return self._iter_records(COLLECTIONS["RULES"], params, per_page, prefetch)
+
+    async def get_active_rules(
+        self,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        incremental: bool = False
+    ) -> List[Rule]:
+        """
+        Get active rules.
+
+        With incremental=True repeated calls only fetch rules changed since
+        the previous call (see poll()).
+        """
+        if incremental:
+            return await self.poll(self.delta_query(COLLECTIONS["RULES"], F.status == 'Active', fields=fields, expand=expand))
+        return await self.get_rules(F.status == 'Active', fields, expand)
+
+    async def create_rule(self, data: Dict) -> Rule:
+        """Create new rule."""
+        return await self._post(f'/collections/{COLLECTIONS["RULES"]}/records', data)
+
+    async def update_rule(self, id: str, data: Dict) -> Rule:
+        """Update rule."""
+        return await self._patch(f'/collections/{COLLECTIONS["RULES"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Users
+    # -------------------------------------------------------------------------
+
+    async def get_users(
+        self,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[User]:
+        """Get all users."""
+        params = _query_params(sort='name', fields=fields, expand=expand)
+        result = await self._get(f'/collections/{COLLECTIONS["USERS"]}/records', params)
+        return result.get('items', [])
+
+    def iter_users(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> AsyncIterator[User]:
+        """Iterate over all users, page by page."""
+        params = _query_params(sort='name', fields=fields, expand=expand)
+        return self._iter_records(COLLECTIONS["USERS"], params, per_page, prefetch)
+
+    async def get_user_by_email(
+        self,
+        email: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Optional[User]:
+        """Find user by email."""
+        params = _query_params(F.email == email, fields=fields, expand=expand)
+        async def fetch():
+            result = await self._get(f'/collections/{COLLECTIONS["USERS"]}/records', params)
+            items = result.get('items', [])
+            return items[0] if items else None
+        return await self._cached_lookup(COLLECTIONS["USERS"], _lookup_key('email', email, params), fetch)
+
+    async def update_user_activity(self, id: str) -> User:
+        """Update user's last activity timestamp."""
+        return await self._patch(f'/collections/{COLLECTIONS["USERS"]}/records/{id}', {
+            'last_activity': datetime.utcnow().isoformat() + 'Z',
+            'status': 'online'
+        })
+
+    # -------------------------------------------------------------------------
+    # Bulk Lookups
+    # -------------------------------------------------------------------------
+
+    async def _find_many(
+        self,
+        collection: str,
+        field: str,
+        op: str,
+        values: Sequence[Any],
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Dict[Any, Dict]:
+        """
+        Resolve many single-record lookups with a few OR-filter requests,
+        sent concurrently (see CRMPocketBase._find_many).
+        """
+        base = _query_params(fields=fields, expand=expand)
+        if 'fields' in base and field not in base['fields'].split(','):
+            base['fields'] += f',{field}'
+        found: Dict[Any, Dict] = {}
+        missing = []
+        for value in dict.fromkeys(values):
+            hit, record = self.cache.get(collection, _lookup_key(field, value, base, op)) if self.cache else (False, None)
+            if hit:
+                if record is not None:
+                    found[value] = record
+            else:
+                missing.append(value)
+
+        async def fetch(chunk: List[Any], expr: Expr) -> None:
+            params = dict(base, filter=str(expr))
+            records = [r async for r in self._iter_records(collection, params, DEFAULT_PER_PAGE)]
+            matched = _match_lookup(records, field, op, chunk)
+            found.update(matched)
+            if self.cache is not None:
+                for value in chunk:
+                    self.cache.set(collection, _lookup_key(field, value, base, op), matched.get(value))
+
+        await asyncio.gather(*(fetch(chunk, expr) for chunk, expr in _chunk_filters(field, op, missing)))
+        return found
+
+    async def find_leads_by_usernames(
+        self,
+        usernames: Sequence[str],
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Dict[str, Lead]:
+        """Find leads for many usernames at once; returns username -> lead."""
+        return await self._find_many(COLLECTIONS["LEADS"], 'username', '=', usernames, fields, expand)
+
+    async def find_actors_by_usernames(
+        self,
+        usernames: Sequence[str],
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Dict[str, InstaActor]:
+        """Find Instagram actors for many usernames at once; returns username -> actor."""
+        return await self._find_many(COLLECTIONS["INSTA_ACTORS"], 'username', '=', usernames, fields, expand)
+
+    async def find_companies_by_phones(
+        self,
+        phones: Sequence[str],
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Dict[str, Company]:
+        """Find companies for many phone numbers at once; returns phone -> company."""
+        return await self._find_many(COLLECTIONS["COMPANIES"], 'phone_numbers', '~', phones, fields, expand)
+
+    # -------------------------------------------------------------------------
+    # Incremental Polling
+    # -------------------------------------------------------------------------
+
+    def delta_query(
+        self,
+        collection: str,
+        filter_str: Optional[FilterLike] = None,
+        sort: Optional[str] = None,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        limit: Optional[int] = None
+    ) -> DeltaQuery:
+        """The DeltaQuery tracking this list query, created on first use."""
+        key = _delta_key(collection, filter_str, sort, fields, expand, limit)
+        query = self._delta_queries.get(key)
+        if query is None:
+            query = self._delta_queries[key] = DeltaQuery(collection, filter_str, sort, fields, expand, limit)
+        return query
+
+    async def poll(self, query: DeltaQuery) -> List[Dict]:
+        """Bring a DeltaQuery up to date and return its records (see CRMPocketBase.poll)."""
+        if query.needs_full_load():
+            query.load(await self._fetch_all(query.collection, query.full_params(), query.limit))
+        else:
+            changed = [r async for r in self._iter_records(query.collection, query.delta_params())]
+            touched_params = query.touched_params()
+            touched = None
+            if touched_params is not None:
+                touched = [r['id'] async for r in self._iter_records(query.collection, touched_params)]
+            query.merge(changed, touched)
+        return query.records()
+
+    async def _fetch_all(self, collection: str, params: Dict, limit: Optional[int] = None) -> List[Dict]:
+        """Every matching record, or the first `limit` in one request."""
+        if limit is None:
+            return [r async for r in self._iter_records(collection, params)]
+        params = {**params, 'perPage': limit, 'skipTotal': 1}
+        result = await self._get(f'/collections/{collection}/records', params)
+        return result.get('items', [])
+
+    # -------------------------------------------------------------------------
+    # Aggregates
+    # -------------------------------------------------------------------------
+
+    async def count(self, collection: str, filter_str: Optional[FilterLike] = None) -> int:
+        """Count the records of a collection matching a filter."""
+        params = _query_params(filter_str, fields='id')
+        params.update({'page': 1, 'perPage': 1, 'skipTotal': 0})
+        result = await self._get(f'/collections/{collection}/records', params)
+        return result.get('totalItems', 0)
+
+    async def exists(self, collection: str, filter_str: Optional[FilterLike] = None) -> bool:
+        """Check whether any record matches a filter, without counting them."""
+        params = _query_params(filter_str, fields='id')
+        params.update({'page': 1, 'perPage': 1, 'skipTotal': 1})
+        result = await self._get(f'/collections/{collection}/records', params)
+        return bool(result.get('items'))
+
+    async def count_many(self, queries: Dict[Any, Tuple[str, Optional[FilterLike]]]) -> Dict[Any, int]:
+        """
+        Run several count queries concurrently (bounded by the semaphore).
+
+        Takes a mapping of key -> (collection, filter) and returns key -> count.
+        """
+        keys = list(queries)
+        counts = await asyncio.gather(*(
+            self.count(collection, filter_str) for collection, filter_str in queries.values()
+        ))
+        return dict(zip(keys, counts))
+
+    # -------------------------------------------------------------------------
+    # Batch
+    # -------------------------------------------------------------------------
+
+    def batch(self, max_requests: int = BATCH_MAX_REQUESTS) -> Batch:
+        """
+        Start a batch of record writes, used as `async with pb.batch() as batch`.
+
+        Same semantics as CRMPocketBase.batch(); the fallback path runs the
+        requests as concurrent tasks bounded by the client's semaphore.
+        """
+        return Batch(self, max_requests)
+
+    async def _send_batch(self, batch: Batch) -> List[Any]:
+        """Send every queued request of a batch and return the result bodies."""
+        results = []
+        for chunk in batch.chunks():
+            if self._batch_supported is not False:
+                try:
+                    results.extend(await self._post_batch(chunk))
+                    self._batch_supported = True
+                    continue
+                except httpx.HTTPStatusError as e:
+                    if self._batch_supported or e.response.status_code not in (403, 404):
+                        raise
+                    self._batch_supported = False
+            results.extend(await self._pipeline_batch(chunk))
+        return results
+
+    async def _post_batch(self, chunk: List[Dict[str, Any]]) -> List[Any]:
+        """Send requests through the transactional /api/batch endpoint."""
+        result = await self._post('/batch', {'requests': [
+            {'method': r['method'], 'url': f"/api{r['endpoint']}", 'body': r['body']}
+            for r in chunk
+        ]})
+        return [item.get('body') for item in result]
+
+    async def _pipeline_batch(self, chunk: List[Dict[str, Any]]) -> List[Any]:
+        """Send requests individually, concurrently where they are independent."""
+        last_touch: Dict[str, asyncio.Future] = {}
+        tasks = []
+        for request in chunk:
+            refs = _batch_refs(request)
+            deps = [last_touch[ref] for ref in refs if ref in last_touch]
+            task = asyncio.ensure_future(self._run_batch_request(request, deps))
+            last_touch[request['id']] = task
+            tasks.append(task)
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def _run_batch_request(self, request: Dict[str, Any], deps: List[asyncio.Future]) -> Any:
+        """Send one queued request once the requests it depends on are done."""
+        for dep in deps:
+            await dep
+        if request['method'] == 'POST':
+            return await self._post(request['endpoint'], request['body'])
+        if request['method'] == 'PATCH':
+            return await self._patch(request['endpoint'], request['body'])
+        await self._delete(request['endpoint'])
+        return None
+
+    # -------------------------------------------------------------------------
+    # Cleanup
+    # -------------------------------------------------------------------------
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+def create_async_client(
+    url: Optional[str] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    **options
+) -> AsyncCRMPocketBase:
+    """Create a new async PocketBase client instance (options as for AsyncCRMPocketBase)."""
+    return AsyncCRMPocketBase(url, max_concurrency, **options)
@@ -0,0 +1,107 @@
+"""
+Batch requests (/api/batch) with client-generated record IDs.
+"""
+
+import string
+import secrets
+from typing import Dict, List, Any, Iterator
+
+
+# PocketBase's default "Max allowed batch requests" setting
+BATCH_MAX_REQUESTS = 50
+
+# Worker threads used when a batch has to fall back to individual requests
+BATCH_PIPELINE_WORKERS = 8
+
+_RECORD_ID_ALPHABET = string.ascii_lowercase + string.digits
+
+
+def generate_record_id() -> str:
+    """Generate a PocketBase-style 15 character record ID."""
+    return ''.join(secrets.choice(_RECORD_ID_ALPHABET) for _ in range(15))
+
+
+def _batch_refs(request: Dict[str, Any]) -> List[str]:
+    """Record IDs a queued batch request touches or points at."""
+    refs = [request['id']]
+    for value in (request['body'] or {}).values():
+        if isinstance(value, str):
+            refs.append(value)
+        elif isinstance(value, list):
+            refs.extend(v for v in value if isinstance(v, str))
+    return refs
+
+
+class Batch:
+    """
+    Collects record creates, updates and deletes and sends them together.
+
+    Obtained from CRMPocketBase.batch() / AsyncCRMPocketBase.batch() and used
+    as a (async) context manager; the queued requests are sent when the block
+    exits without an exception and the response bodies are stored in
+    `results`, in queue order.
+
+    Creates get a client-generated ID up front so later requests in the same
+    batch can reference the new record. `workers` caps the threads the sync
+    client uses if it has to fall back to individual requests.
+    """
+
+    def __init__(self, client: Any, max_requests: int = BATCH_MAX_REQUESTS,
+                 workers: int = BATCH_PIPELINE_WORKERS):
+        self._client = client
+        self.max_requests = max_requests
+        self.workers = workers
+        self.requests: List[Dict[str, Any]] = []
+        self.results: List[Any] = []
+
+    def create(self, collection: str, data: Dict) -> str:
+        """Queue a record create and return the ID the record will get."""
+        body = dict(data)
+        body.setdefault('id', generate_record_id())
+        self.requests.append({
+            'method': 'POST',
+            'endpoint': f'/collections/{collection}/records',
+            'id': body['id'],
+            'body': body,
+        })
+        return body['id']
+
+    def update(self, collection: str, id: str, data: Dict) -> None:
+        """Queue a record update."""
+        self.requests.append({
+            'method': 'PATCH',
+            'endpoint': f'/collections/{collection}/records/{id}',
+            'id': id,
+            'body': data,
+        })
+
+    def delete(self, collection: str, id: str) -> None:
+        """Queue a record delete."""
+        self.requests.append({
+            'method': 'DELETE',
+            'endpoint': f'/collections/{collection}/records/{id}',
+            'id': id,
+            'body': None,
+        })
+
+    def chunks(self) -> Iterator[List[Dict[str, Any]]]:
+        """Split the queue into requests the server will accept at once."""
+        for start in range(0, len(self.requests), self.max_requests):
+            yield self.requests[start:start + self.max_requests]
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None and self.requests:
+            self.results = self._client._send_batch(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None and self.requests:
+            self.results = await self._client._send_batch(self)
@@ -0,0 +1,135 @@
+"""
+TTL/LRU cache for the client lookup methods.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+from .query import _RECORD_ENDPOINT, _record_matches
+
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 60.0
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-collection TTLs for record lookups.
+
+    Pass one to CRMPocketBase(cache=...) to serve the find_* / get_*_by_*
+    lookups from memory. Entries are keyed by (collection, (field, op, value,
+    ...)) and hold a record or None (a cached "not found"). Writes made
+    through the client call invalidate() so entries the write affects are
+    refreshed or dropped.
+
+    Any object with the same get/set/invalidate methods can be plugged in
+    instead.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+        ttls: Optional[Dict[str, float]] = None
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self._entries: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.evictions = 0
+
+    def get(self, collection: str, key: Any) -> Tuple[bool, Any]:
+        """Return (hit, value) for a lookup key."""
+        with self._lock:
+            entry = self._entries.get((collection, key))
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end((collection, key))
+                self.hits[collection] = self.hits.get(collection, 0) + 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[(collection, key)]
+            self.misses[collection] = self.misses.get(collection, 0) + 1
+            return False, None
+
+    def set(self, collection: str, key: Any, value: Any) -> None:
+        """Store a lookup result (a record or None)."""
+        expires = time.monotonic() + self.ttls.get(collection, self.ttl)
+        with self._lock:
+            self._entries[(collection, key)] = (expires, value)
+            self._entries.move_to_end((collection, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(
+        self,
+        collection: str,
+        record_id: Optional[str] = None,
+        record: Optional[Dict] = None
+    ) -> None:
+        """
+        Account for a write to a collection.
+
+        `record` is the record as returned by the write, if known. Entries
+        that the written record now matches take it as their value; entries
+        holding record_id that it no longer matches are dropped. Without
+        `record`, every cached "not found" of the collection is dropped too.
+        Projected/expanded entries can't be rebuilt from a write and are
+        dropped instead of refreshed.
+        """
+        with self._lock:
+            for k, (expires, value) in list(self._entries.items()):
+                if k[0] != collection:
+                    continue
+                holds_record = value is not None and record_id is not None and value.get('id') == record_id
+                if value is not None and not holds_record:
+                    continue
+                field, op, key_value = k[1][:3]
+                if record is not None and _record_matches(record, field, op, key_value):
+                    if len(k[1]) == 3:
+                        self._entries[k] = (expires, record)
+                    else:
+                        del self._entries[k]
+                elif holds_record or record is None:
+                    del self._entries[k]
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, overall and per collection."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': sum(self.hits.values()),
+                'misses': sum(self.misses.values()),
+                'evictions': self.evictions,
+                'collections': {
+                    c: {'hits': self.hits.get(c, 0), 'misses': self.misses.get(c, 0)}
+                    for c in sorted(set(self.hits) | set(self.misses))
+                },
+            }
+
+
+def _invalidate_cache(cache: Any, endpoint: str, data: Optional[Dict] = None, result: Any = None) -> None:
+    """Invalidate cache entries affected by a successful write request."""
+    if cache is None:
+        return
+    if endpoint == '/batch':
+        bodies = result if isinstance(result, list) else []
+        for i, request in enumerate(data['requests']):
+            body = bodies[i].get('body') if i < len(bodies) else None
+            _invalidate_cache(cache, request['url'][len('/api'):], request.get('body'), body)
+        return
+    match = _RECORD_ENDPOINT.match(endpoint)
+    if match:
+        record = result if isinstance(result, dict) else None
+        record_id = match.group(2) or (data or {}).get('id') or (record or {}).get('id')
+        cache.invalidate(match.group(1), record_id, record)
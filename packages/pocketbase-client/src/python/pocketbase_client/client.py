@@ -0,0 +1,1021 @@
+"""
+Synchronous PocketBase client.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Callable, Iterator, Sequence, Tuple, Union
+from datetime import datetime
+
+import httpx
+
+from .types import (
+    User, Company, ColdCall, CallTranscript, Lead, InstaActor,
+    EventLog, OutreachLog, Goal, Rule, COLLECTIONS,
+    ColdCallStruct, LeadStruct, EventLogStruct,
+)
+from .filters import F, FilterLike
+from .query import (
+    DEFAULT_PER_PAGE, FieldSpec, _query_params, _chunk_filters,
+    _match_lookup, _lookup_key,
+)
+from .pool import (
+    DEFAULT_TIMEOUT, DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_KEEPALIVE_EXPIRY, _http_client_options, shared_http_client,
+)
+from .cache import TTLCache, _invalidate_cache
+from .codec import DEFAULT_DECODER, JSONDecoder, struct_fields
+from .metrics import PreRequestHook, PostRequestHook, _request_event, _call_hooks
+from .polling import DeltaQuery, _delta_key
+from .retry import (
+    TOKEN_REFRESH_MARGIN, RetryPolicy, DEFAULT_RETRY,
+    _token_expires_at, _is_auth_endpoint,
+)
+from .batch import BATCH_MAX_REQUESTS, BATCH_PIPELINE_WORKERS, Batch, _batch_refs
+
+if TYPE_CHECKING:
+    from .ratelimit import RateLimiter
+    from .realtime import Realtime, Subscription
+
+
+# Worker threads used by CRMPocketBase.count_many()
+COUNT_WORKERS = 8
+
+
+class CRMPocketBase:
+    """
+    PocketBase client for CRM-Tableturnerr Python applications.
+
+    Connection options:
+        timeout: Seconds, or an httpx.Timeout for per-phase limits
+            (e.g. httpx.Timeout(30.0, connect=5.0)).
+        max_connections / max_keepalive_connections: Pool size.
+        keepalive_expiry: Seconds an idle pooled connection is kept open.
+        http2: Multiplex requests over HTTP/2 (needs `httpx[http2]`).
+        shared: Use the process-wide client for these options (see
+            shared_http_client()) instead of a private one; close() then
+            leaves the pool open for other users.
+
+    cache: Optional TTLCache (or compatible object) serving the lookup
+        methods; writes made through this client invalidate it.
+
+    retry: RetryPolicy for transient failures (None disables retries).
+        After auth_as_admin()/auth_with_password() the credentials are kept
+        so an expiring or rejected (401) token is renewed transparently.
+
+    decoder: JSONDecoder for response bodies (default: msgspec or orjson
+        when installed, else stdlib json).
+
+    rate_limiter: Optional RateLimiter applied to every attempt; share one
+        between clients to keep their combined traffic under the server's
+        limits.
+
+    pre_request_hooks / post_request_hooks: Callables run before and after
+        every HTTP attempt (see metrics.RequestEvent); Metrics().attach(pb)
+        uses them to record per-endpoint latency and traffic.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+        max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        shared: bool = False,
+        cache: Optional[TTLCache] = None,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+        decoder: Optional[JSONDecoder] = None,
+        rate_limiter: Optional['RateLimiter'] = None
+    ):
+        self.url = url or os.getenv('POCKETBASE_URL', 'http://localhost:8090')
+        self.token: Optional[str] = None
+        self.user: Optional[User] = None
+        options = {
+            'timeout': timeout,
+            'max_connections': max_connections,
+            'max_keepalive_connections': max_keepalive_connections,
+            'keepalive_expiry': keepalive_expiry,
+            'http2': http2,
+        }
+        self._owns_client = not shared
+        if shared:
+            self._client = shared_http_client(**options)
+        else:
+            self._client = httpx.Client(**_http_client_options(**options))
+        self.cache = cache
+        self.retry = retry
+        self.decoder = decoder or DEFAULT_DECODER
+        self.rate_limiter = rate_limiter
+        self.pre_request_hooks: List[PreRequestHook] = []
+        self.post_request_hooks: List[PostRequestHook] = []
+        self._reauthenticate: Optional[Callable[[], Any]] = None
+        self._auth_lock = threading.Lock()
+        self._batch_supported: Optional[bool] = None
+        self._delta_queries: Dict[tuple, DeltaQuery] = {}
+        self._delta_lock = threading.Lock()
+        self._realtime: Optional['Realtime'] = None
+
+    def _headers(self) -> Dict[str, str]:
+        """Get request headers with auth token if available."""
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = self.token
+        return headers
+
+    def _request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transient failures and renewing the token."""
+        body = kwargs.get('json')
+        if not _is_auth_endpoint(endpoint):
+            self._refresh_expiring_token()
+        attempt = 0
+        sent = 0
+        reauthenticated = False
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(method, endpoint)
+            token = self.token
+            response = error = None
+            headers = self._headers()
+            _call_hooks(self.pre_request_hooks, method, endpoint, headers)
+            started = time.perf_counter()
+            try:
+                response = self._client.request(
+                    method,
+                    f"{self.url}/api{endpoint}",
+                    headers=headers,
+                    **kwargs
+                )
+            except httpx.TransportError as e:
+                error = e
+            if self.post_request_hooks:
+                event = _request_event(method, endpoint, response, error, time.perf_counter() - started, sent)
+                _call_hooks(self.post_request_hooks, event)
+            if self.rate_limiter is not None:
+                self.rate_limiter.update(method, endpoint, response)
+            sent += 1
+            if (response is not None and response.status_code == 401 and not reauthenticated
+                    and self._reauthenticate and not _is_auth_endpoint(endpoint)):
+                reauthenticated = True
+                self._renew_token(token)
+                continue
+            if response is not None and response.is_success:
+                return response
+            delay = self.retry.next_delay(attempt, method, endpoint, body, response, error) if self.retry else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+                return response
+            attempt += 1
+            time.sleep(delay)
+
+    def _renew_token(self, stale_token: Optional[str]) -> None:
+        """Re-authenticate with the stored credentials, once per stale token."""
+        with self._auth_lock:
+            if self.token == stale_token:
+                self._reauthenticate()
+
+    def _refresh_expiring_token(self) -> None:
+        """Renew a token that expires within TOKEN_REFRESH_MARGIN seconds."""
+        if self._reauthenticate is None:
+            return
+        expires_at = _token_expires_at(self.token)
+        if expires_at is not None and expires_at - time.time() < TOKEN_REFRESH_MARGIN:
+            self._renew_token(self.token)
+
+    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        """Make GET request to PocketBase API."""
+        response = self._request('GET', endpoint, params=params)
+        return self.decoder.decode(response.content)
+
+    def _post(self, endpoint: str, data: Dict) -> Any:
+        """Make POST request to PocketBase API."""
+        response = self._request('POST', endpoint, json=data)
+        result = self.decoder.decode(response.content)
+        _invalidate_cache(self.cache, endpoint, data, result)
+        return result
+
+    def _patch(self, endpoint: str, data: Dict) -> Any:
+        """Make PATCH request to PocketBase API."""
+        response = self._request('PATCH', endpoint, json=data)
+        result = self.decoder.decode(response.content)
+        _invalidate_cache(self.cache, endpoint, data, result)
+        return result
+
+    def _delete(self, endpoint: str) -> bool:
+        """Make DELETE request to PocketBase API."""
+        self._request('DELETE', endpoint)
+        _invalidate_cache(self.cache, endpoint)
+        return True
+
+    def _cached_lookup(self, collection: str, key: Any, fetch: Callable[[], Any]) -> Any:
+        """Serve a lookup from the cache, calling fetch() on a miss."""
+        if self.cache is None:
+            return fetch()
+        hit, value = self.cache.get(collection, key)
+        if hit:
+            return value
+        value = fetch()
+        self.cache.set(collection, key, value)
+        return value
+
+    def _iter_records(
+        self,
+        collection: str,
+        params: Optional[Dict] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        struct: Optional[type] = None
+    ) -> Iterator[Any]:
+        """
+        Stream every record of a collection, fetching pages lazily.
+
+        Pages are requested with skipTotal so the server does not have to count
+        the whole collection; iteration stops at the first short page. With
+        prefetch=True the next page is fetched in the background while the
+        current one is being consumed. With struct, items are decoded into
+        instances of it (see JSONDecoder.decode_items).
+        """
+        endpoint = f'/collections/{collection}/records'
+        base = dict(params or {})
+        base['perPage'] = per_page
+        base['skipTotal'] = 1
+        if struct is not None and 'fields' not in base:
+            base['fields'] = ','.join(struct_fields(struct))
+
+        def fetch(page: int) -> List[Any]:
+            if struct is not None:
+                response = self._request('GET', endpoint, params={**base, 'page': page})
+                return self.decoder.decode_items(response.content, struct)
+            return self._get(endpoint, {**base, 'page': page}).get('items', [])
+
+        if not prefetch:
+            page = 1
+            while True:
+                items = fetch(page)
+                yield from items
+                if len(items) < per_page:
+                    return
+                page += 1
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            page = 1
+            pending = pool.submit(fetch, page)
+            while pending is not None:
+                items = pending.result()
+                page += 1
+                pending = pool.submit(fetch, page) if len(items) >= per_page else None
+                yield from items
+
+    # -------------------------------------------------------------------------
+    # Authentication
+    # -------------------------------------------------------------------------
+
+    def auth_as_admin(self, email: str, password: str) -> None:
+        """Authenticate as admin for server-side operations."""
+        result = self._post('/admins/auth-with-password', {
+            'identity': email,
+            'password': password
+        })
+        self.token = result['token']
+        self._reauthenticate = lambda: self.auth_as_admin(email, password)
+
+    def auth_with_password(self, email: str, password: str) -> User:
+        """Authenticate user with email/password."""
+        result = self._post(f'/collections/{COLLECTIONS["USERS"]}/auth-with-password', {
+            'identity': email,
+            'password': password
+        })
+        self.token = result['token']
+        self.user = result['record']
+        self._reauthenticate = lambda: self.auth_with_password(email, password)
+        return self.user
+
+    def logout(self) -> None:
+        """Clear authentication."""
+        self.token = None
+        self.user = None
+        self._reauthenticate = None
+
+    @property
+    def is_authenticated(self) -> bool:
+        """Check if client is authenticated."""
+        return self.token is not None
+
+    # -------------------------------------------------------------------------
+    # Companies
+    # -------------------------------------------------------------------------
+
+    def get_companies(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[Company]:
+        """Get all companies."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        result = self._get(f'/collections/{COLLECTIONS["COMPANIES"]}/records', params)
+        return result.get('items', [])
+
+    def iter_companies(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Iterator[Company]:
+        """Iterate over all companies, page by page."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        return self._iter_records(COLLECTIONS["COMPANIES"], params, per_page, prefetch)
+
+    def get_company(
+        self,
+        id: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Company:
+        """Get company by ID."""
+        params = _query_params(fields=fields, expand=expand)
+        return self._get(f'/collections/{COLLECTIONS["COMPANIES"]}/records/{id}', params)
+
+    def find_company_by_phone(
+        self,
+        phone: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Optional[Company]:
+        """Find company by phone number."""
+        params = _query_params(F.phone_numbers.contains(phone), fields=fields, expand=expand)
+        def fetch():
+            result = self._get(f'/collections/{COLLECTIONS["COMPANIES"]}/records', params)
+            items = result.get('items', [])
+            return items[0] if items else None
+        return self._cached_lookup(COLLECTIONS["COMPANIES"], _lookup_key('phone_numbers', phone, params, '~'), fetch)
+
+    def create_company(self, data: Dict) -> Company:
+        """Create new company."""
+        return self._post(f'/collections/{COLLECTIONS["COMPANIES"]}/records', data)
+
+    def update_company(self, id: str, data: Dict) -> Company:
+        """Update company."""
+        return self._patch(f'/collections/{COLLECTIONS["COMPANIES"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Cold Calls
+    # -------------------------------------------------------------------------
+
+    def get_cold_calls(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        sort: str = '-created',
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[ColdCall]:
+        """Get cold calls."""
+        params = _query_params(filter_str, sort, fields, expand)
+        result = self._get(f'/collections/{COLLECTIONS["COLD_CALLS"]}/records', params)
+        return result.get('items', [])
+
+    def iter_cold_calls(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        sort: str = '-created',
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        struct: Optional[type] = None
+    ) -> Iterator[Union[ColdCall, ColdCallStruct]]:
+        """
+        Iterate over all cold calls, page by page.
+
+        With struct (e.g. ColdCallStruct) records are decoded straight into
+        instances of it and only its fields are requested.
+        """
+        params = _query_params(filter_str, sort, fields, expand)
+        return self._iter_records(COLLECTIONS["COLD_CALLS"], params, per_page, prefetch, struct)
+
+    def get_cold_call(
+        self,
+        id: str,
+        expand: Optional[FieldSpec] = None,
+        fields: Optional[FieldSpec] = None
+    ) -> ColdCall:
+        """Get cold call by ID."""
+        params = _query_params(fields=fields, expand=expand)
+        return self._get(f'/collections/{COLLECTIONS["COLD_CALLS"]}/records/{id}', params)
+
+    def create_cold_call(self, data: Dict) -> ColdCall:
+        """Create new cold call."""
+        return self._post(f'/collections/{COLLECTIONS["COLD_CALLS"]}/records', data)
+
+    def update_cold_call(self, id: str, data: Dict) -> ColdCall:
+        """Update cold call."""
+        return self._patch(f'/collections/{COLLECTIONS["COLD_CALLS"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Call Transcripts
+    # -------------------------------------------------------------------------
+
+    def get_transcript_for_call(
+        self,
+        call_id: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Optional[CallTranscript]:
+        """Get transcript for a specific call."""
+        params = _query_params(F.call == call_id, fields=fields, expand=expand)
+        result = self._get(f'/collections/{COLLECTIONS["CALL_TRANSCRIPTS"]}/records', params)
+        items = result.get('items', [])
+        return items[0] if items else None
+
+    def create_transcript(self, data: Dict) -> CallTranscript:
+        """Create new transcript."""
+        return self._post(f'/collections/{COLLECTIONS["CALL_TRANSCRIPTS"]}/records', data)
+
+    # -------------------------------------------------------------------------
+    # Leads
+    # -------------------------------------------------------------------------
+
+    def get_leads(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        sort: str = '-last_updated',
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[Lead]:
+        """Get leads."""
+        params = _query_params(filter_str, sort, fields, expand)
+        result = self._get(f'/collections/{COLLECTIONS["LEADS"]}/records', params)
+        return result.get('items', [])
+
+    def iter_leads(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        sort: str = '-last_updated',
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        struct: Optional[type] = None
+    ) -> Iterator[Union[Lead, LeadStruct]]:
+        """
+        Iterate over all leads, page by page.
+
+        With struct (e.g. LeadStruct) records are decoded straight into
+        instances of it and only its fields are requested.
+        """
+        params = _query_params(filter_str, sort, fields, expand)
+        return self._iter_records(COLLECTIONS["LEADS"], params, per_page, prefetch, struct)
+
+    def find_lead_by_username(
+        self,
+        username: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Optional[Lead]:
+        """Find lead by username."""
+        params = _query_params(F.username == username, fields=fields, expand=expand)
+        def fetch():
+            result = self._get(f'/collections/{COLLECTIONS["LEADS"]}/records', params)
+            items = result.get('items', [])
+            return items[0] if items else None
+        return self._cached_lookup(COLLECTIONS["LEADS"], _lookup_key('username', username, params), fetch)
+
+    def create_lead(self, data: Dict) -> Lead:
+        """Create new lead."""
+        return self._post(f'/collections/{COLLECTIONS["LEADS"]}/records', data)
+
+    def update_lead(self, id: str, data: Dict) -> Lead:
+        """Update lead."""
+        return self._patch(f'/collections/{COLLECTIONS["LEADS"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Insta Actors
+    # -------------------------------------------------------------------------
+
+    def find_actor_by_username(
+        self,
+        username: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Optional[InstaActor]:
+        """Find Instagram actor by username."""
+        params = _query_params(F.username == username, fields=fields, expand=expand)
+        def fetch():
+            result = self._get(f'/collections/{COLLECTIONS["INSTA_ACTORS"]}/records', params)
+            items = result.get('items', [])
+            return items[0] if items else None
+        return self._cached_lookup(COLLECTIONS["INSTA_ACTORS"], _lookup_key('username', username, params), fetch)
+
+    def iter_actors(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Iterator[InstaActor]:
+        """Iterate over all Instagram actors, page by page."""
+        params = _query_params(sort='username', fields=fields, expand=expand)
+        return self._iter_records(COLLECTIONS["INSTA_ACTORS"], params, per_page, prefetch)
+
+    def update_actor(self, id: str, data: Dict) -> InstaActor:
+        """Update Instagram actor."""
+        return self._patch(f'/collections/{COLLECTIONS["INSTA_ACTORS"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Event Logs
+    # -------------------------------------------------------------------------
+
+    def get_event_logs(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        limit: int = 100,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        incremental: bool = False
+    ) -> List[EventLog]:
+        """
+        Get event logs, newest first.
+
+        With incremental=True repeated calls with the same arguments only
+        fetch logs changed since the previous call (see poll()).
+        """
+        if incremental:
+            return self.poll(self.delta_query(COLLECTIONS["EVENT_LOGS"], filter_str, '-created', fields, expand, limit))
+        params = _query_params(filter_str, '-created', fields, expand)
+        params['perPage'] = limit
+        result = self._get(f'/collections/{COLLECTIONS["EVENT_LOGS"]}/records', params)
+        return result.get('items', [])
+
+    def iter_event_logs(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        struct: Optional[type] = None
+    ) -> Iterator[Union[EventLog, EventLogStruct]]:
+        """
+        Iterate over all event logs, newest first, page by page.
+
+        With struct (e.g. EventLogStruct) records are decoded straight into
+        instances of it and only its fields are requested.
+        """
+        params = _query_params(filter_str, '-created', fields, expand)
+        return self._iter_records(COLLECTIONS["EVENT_LOGS"], params, per_page, prefetch, struct)
+
+    def create_event_log(self, data: Dict) -> EventLog:
+        """Create new event log."""
+        return self._post(f'/collections/{COLLECTIONS["EVENT_LOGS"]}/records', data)
+
+    # -------------------------------------------------------------------------
+    # Outreach Logs
+    # -------------------------------------------------------------------------
+
+    def create_outreach_log(self, data: Dict) -> OutreachLog:
+        """Create new outreach log."""
+        return self._post(f'/collections/{COLLECTIONS["OUTREACH_LOGS"]}/records', data)
+
+    # -------------------------------------------------------------------------
+    # Goals
+    # -------------------------------------------------------------------------
+
+    def get_goals(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[Goal]:
+        """Get goals."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        result = self._get(f'/collections/{COLLECTIONS["GOALS"]}/records', params)
+        return result.get('items', [])
+
+    def iter_goals(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Iterator[Goal]:
+        """Iterate over all goals, page by page."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        return self._iter_records(COLLECTIONS["GOALS"], params, per_page, prefetch)
+
+    def get_active_goals(
+        self,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        incremental: bool = False
+    ) -> List[Goal]:
+        """
+        Get active goals.
+
+        With incremental=True repeated calls only fetch goals changed since
+        the previous call (see poll()).
+        """
+        if incremental:
+            return self.poll(self.delta_query(COLLECTIONS["GOALS"], F.status == 'Active', fields=fields, expand=expand))
+        return self.get_goals(F.status == 'Active', fields, expand)
+
+    def create_goal(self, data: Dict) -> Goal:
+        """Create new goal."""
+        return self._post(f'/collections/{COLLECTIONS["GOALS"]}/records', data)
+
+    def update_goal(self, id: str, data: Dict) -> Goal:
+        """Update goal."""
+        return self._patch(f'/collections/{COLLECTIONS["GOALS"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Rules
+    # -------------------------------------------------------------------------
+
+    def get_rules(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[Rule]:
+        """Get rules."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        result = self._get(f'/collections/{COLLECTIONS["RULES"]}/records', params)
+        return result.get('items', [])
+
+    def iter_rules(
+        self,
+        filter_str: Optional[FilterLike] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Iterator[Rule]:
+        """Iterate over all rules, page by page."""
+        params = _query_params(filter_str, fields=fields, expand=expand)
+        return self._iter_records(COLLECTIONS["RULES"], params, per_page, prefetch)
+
+    def get_active_rules(
+        self,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        incremental: bool = False
+    ) -> List[Rule]:
+        """
+        Get active rules.
+
+        With incremental=True repeated calls only fetch rules changed since
+        the previous call (see poll()).
+        """
+        if incremental:
+            return self.poll(self.delta_query(COLLECTIONS["RULES"], F.status == 'Active', fields=fields, expand=expand))
+        return self.get_rules(F.status == 'Active', fields, expand)
+
+    def create_rule(self, data: Dict) -> Rule:
+        """Create new rule."""
+        return self._post(f'/collections/{COLLECTIONS["RULES"]}/records', data)
+
+    def update_rule(self, id: str, data: Dict) -> Rule:
+        """Update rule."""
+        return self._patch(f'/collections/{COLLECTIONS["RULES"]}/records/{id}', data)
+
+    # -------------------------------------------------------------------------
+    # Users
+    # -------------------------------------------------------------------------
+
+    def get_users(
+        self,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> List[User]:
+        """Get all users."""
+        params = _query_params(sort='name', fields=fields, expand=expand)
+        result = self._get(f'/collections/{COLLECTIONS["USERS"]}/records', params)
+        return result.get('items', [])
+
+    def iter_users(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Iterator[User]:
+        """Iterate over all users, page by page."""
+        params = _query_params(sort='name', fields=fields, expand=expand)
+        return self._iter_records(COLLECTIONS["USERS"], params, per_page, prefetch)
+
+    def get_user_by_email(
+        self,
+        email: str,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Optional[User]:
+        """Find user by email."""
+        params = _query_params(F.email == email, fields=fields, expand=expand)
+        def fetch():
+            result = self._get(f'/collections/{COLLECTIONS["USERS"]}/records', params)
+            items = result.get('items', [])
+            return items[0] if items else None
+        return self._cached_lookup(COLLECTIONS["USERS"], _lookup_key('email', email, params), fetch)
+
+    def update_user_activity(self, id: str) -> User:
+        """Update user's last activity timestamp."""
+        return self._patch(f'/collections/{COLLECTIONS["USERS"]}/records/{id}', {
+            'last_activity': datetime.utcnow().isoformat() + 'Z',
+            'status': 'online'
+        })
+
+    # -------------------------------------------------------------------------
+    # Bulk Lookups
+    # -------------------------------------------------------------------------
+
+    def _find_many(
+        self,
+        collection: str,
+        field: str,
+        op: str,
+        values: Sequence[Any],
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Dict[Any, Dict]:
+        """
+        Resolve many single-record lookups with a few OR-filter requests.
+
+        Values already in the cache are served from it; the rest are chunked
+        so no request URL gets too long, and every result (including "not
+        found") is written back to the cache.
+        """
+        base = _query_params(fields=fields, expand=expand)
+        if 'fields' in base and field not in base['fields'].split(','):
+            base['fields'] += f',{field}'
+        found: Dict[Any, Dict] = {}
+        missing = []
+        for value in dict.fromkeys(values):
+            hit, record = self.cache.get(collection, _lookup_key(field, value, base, op)) if self.cache else (False, None)
+            if hit:
+                if record is not None:
+                    found[value] = record
+            else:
+                missing.append(value)
+        for chunk, expr in _chunk_filters(field, op, missing):
+            params = dict(base, filter=str(expr))
+            records = list(self._iter_records(collection, params, DEFAULT_PER_PAGE))
+            matched = _match_lookup(records, field, op, chunk)
+            found.update(matched)
+            if self.cache is not None:
+                for value in chunk:
+                    self.cache.set(collection, _lookup_key(field, value, base, op), matched.get(value))
+        return found
+
+    def find_leads_by_usernames(
+        self,
+        usernames: Sequence[str],
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Dict[str, Lead]:
+        """Find leads for many usernames at once; returns username -> lead."""
+        return self._find_many(COLLECTIONS["LEADS"], 'username', '=', usernames, fields, expand)
+
+    def find_actors_by_usernames(
+        self,
+        usernames: Sequence[str],
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Dict[str, InstaActor]:
+        """Find Instagram actors for many usernames at once; returns username -> actor."""
+        return self._find_many(COLLECTIONS["INSTA_ACTORS"], 'username', '=', usernames, fields, expand)
+
+    def find_companies_by_phones(
+        self,
+        phones: Sequence[str],
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None
+    ) -> Dict[str, Company]:
+        """Find companies for many phone numbers at once; returns phone -> company."""
+        return self._find_many(COLLECTIONS["COMPANIES"], 'phone_numbers', '~', phones, fields, expand)
+
+    # -------------------------------------------------------------------------
+    # Incremental Polling
+    # -------------------------------------------------------------------------
+
+    def delta_query(
+        self,
+        collection: str,
+        filter_str: Optional[FilterLike] = None,
+        sort: Optional[str] = None,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        limit: Optional[int] = None
+    ) -> DeltaQuery:
+        """The DeltaQuery tracking this list query, created on first use."""
+        key = _delta_key(collection, filter_str, sort, fields, expand, limit)
+        with self._delta_lock:
+            query = self._delta_queries.get(key)
+            if query is None:
+                query = self._delta_queries[key] = DeltaQuery(collection, filter_str, sort, fields, expand, limit)
+        return query
+
+    def poll(self, query: DeltaQuery) -> List[Dict]:
+        """
+        Bring a DeltaQuery up to date and return its records.
+
+        The first poll loads the full result; later ones fetch only records
+        changed since the last one (plus a periodic full reload, see
+        DeltaQuery).
+        """
+        with query.lock:
+            if query.needs_full_load():
+                query.load(self._fetch_all(query.collection, query.full_params(), query.limit))
+            else:
+                changed = list(self._iter_records(query.collection, query.delta_params()))
+                touched_params = query.touched_params()
+                touched = None
+                if touched_params is not None:
+                    touched = [r['id'] for r in self._iter_records(query.collection, touched_params)]
+                query.merge(changed, touched)
+            return query.records()
+
+    def _fetch_all(self, collection: str, params: Dict, limit: Optional[int] = None) -> List[Dict]:
+        """Every matching record, or the first `limit` in one request."""
+        if limit is None:
+            return list(self._iter_records(collection, params))
+        params = {**params, 'perPage': limit, 'skipTotal': 1}
+        return self._get(f'/collections/{collection}/records', params).get('items', [])
+
+    # -------------------------------------------------------------------------
+    # Aggregates
+    # -------------------------------------------------------------------------
+
+    def count(self, collection: str, filter_str: Optional[FilterLike] = None) -> int:
+        """
+        Count the records of a collection matching a filter.
+
+        Asks for a single 'id' field of a single record so only the
+        totalItems count travels back.
+        """
+        params = _query_params(filter_str, fields='id')
+        params.update({'page': 1, 'perPage': 1, 'skipTotal': 0})
+        result = self._get(f'/collections/{collection}/records', params)
+        return result.get('totalItems', 0)
+
+    def exists(self, collection: str, filter_str: Optional[FilterLike] = None) -> bool:
+        """Check whether any record matches a filter, without counting them."""
+        params = _query_params(filter_str, fields='id')
+        params.update({'page': 1, 'perPage': 1, 'skipTotal': 1})
+        result = self._get(f'/collections/{collection}/records', params)
+        return bool(result.get('items'))
+
+    def count_many(
+        self,
+        queries: Dict[Any, Tuple[str, Optional[FilterLike]]],
+        max_workers: int = COUNT_WORKERS
+    ) -> Dict[Any, int]:
+        """
+        Run several count queries concurrently.
+
+            stats = pb.count_many({
+                (user_id, 'calls'): (COLLECTIONS['COLD_CALLS'], F.claimed_by == user_id),
+                ...
+            })
+
+        Takes a mapping of key -> (collection, filter) and returns key -> count.
+        """
+        if not queries:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(queries), max_workers)) as pool:
+            futures = {
+                key: pool.submit(self.count, collection, filter_str)
+                for key, (collection, filter_str) in queries.items()
+            }
+        return {key: future.result() for key, future in futures.items()}
+
+    # -------------------------------------------------------------------------
+    # Batch
+    # -------------------------------------------------------------------------
+
+    def batch(self, max_requests: int = BATCH_MAX_REQUESTS,
+              workers: int = BATCH_PIPELINE_WORKERS) -> Batch:
+        """
+        Start a batch of record writes.
+
+            with pb.batch() as batch:
+                lead_id = batch.create(COLLECTIONS['LEADS'], {...})
+                batch.create(COLLECTIONS['EVENT_LOGS'], {'target': lead_id, ...})
+            event = batch.results[1]
+
+        The requests are sent through /api/batch as one transaction (one per
+        max_requests chunk). If the server has no batch endpoint, or it is
+        disabled, they are sent individually and concurrently instead; in that
+        case a request only waits for earlier requests touching the records it
+        references, and nothing is rolled back on failure. At most `workers`
+        of them are in flight at once; pass workers=1 from code that already
+        runs on its own bounded pool.
+        """
+        return Batch(self, max_requests, workers)
+
+    def _send_batch(self, batch: Batch) -> List[Any]:
+        """Send every queued request of a batch and return the result bodies."""
+        results = []
+        for chunk in batch.chunks():
+            if self._batch_supported is not False:
+                try:
+                    results.extend(self._post_batch(chunk))
+                    self._batch_supported = True
+                    continue
+                except httpx.HTTPStatusError as e:
+                    if self._batch_supported or e.response.status_code not in (403, 404):
+                        raise
+                    self._batch_supported = False
+            results.extend(self._pipeline_batch(chunk, batch.workers))
+        return results
+
+    def _post_batch(self, chunk: List[Dict[str, Any]]) -> List[Any]:
+        """Send requests through the transactional /api/batch endpoint."""
+        result = self._post('/batch', {'requests': [
+            {'method': r['method'], 'url': f"/api{r['endpoint']}", 'body': r['body']}
+            for r in chunk
+        ]})
+        return [item.get('body') for item in result]
+
+    def _pipeline_batch(self, chunk: List[Dict[str, Any]], workers: int) -> List[Any]:
+        """Send requests individually, concurrently where they are independent."""
+        last_touch: Dict[str, Future] = {}
+        futures = []
+        with ThreadPoolExecutor(max_workers=min(len(chunk), workers)) as pool:
+            for request in chunk:
+                refs = _batch_refs(request)
+                deps = [last_touch[ref] for ref in refs if ref in last_touch]
+                future = pool.submit(self._run_batch_request, request, deps)
+                last_touch[request['id']] = future
+                futures.append(future)
+        return [future.result() for future in futures]
+
+    def _run_batch_request(self, request: Dict[str, Any], deps: List[Future]) -> Any:
+        """Send one queued request once the requests it depends on are done."""
+        for dep in deps:
+            dep.result()
+        if request['method'] == 'POST':
+            return self._post(request['endpoint'], request['body'])
+        if request['method'] == 'PATCH':
+            return self._patch(request['endpoint'], request['body'])
+        self._delete(request['endpoint'])
+        return None
+
+    # -------------------------------------------------------------------------
+    # Realtime
+    # -------------------------------------------------------------------------
+
+    def subscribe(
+        self,
+        collection: str,
+        callback: Callable[[str, Dict], Any],
+        filter_str: Optional[FilterLike] = None,
+        record_id: str = '*'
+    ) -> 'Subscription':
+        """
+        Receive record changes of a collection as they happen.
+
+            sub = pb.subscribe(COLLECTIONS['LEADS'], on_lead, F.status == 'Warm')
+            ...
+            sub.unsubscribe()
+
+        callback(action, record) is called with 'create', 'update' or
+        'delete' from the realtime thread. All subscriptions share one
+        connection; see Realtime for reconnect behaviour.
+        """
+        if self._realtime is None:
+            from .realtime import Realtime
+            self._realtime = Realtime(self)
+        return self._realtime.subscribe(collection, callback, filter_str, record_id)
+
+    def unsubscribe_all(self) -> None:
+        """Drop every realtime subscription and close the connection."""
+        if self._realtime is not None:
+            self._realtime.close()
+
+    # -------------------------------------------------------------------------
+    # Cleanup
+    # -------------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Close the HTTP client (shared clients stay open)."""
+        self.unsubscribe_all()
+        if self._owns_client:
+            self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def create_client(url: Optional[str] = None, **options) -> CRMPocketBase:
+    """Create a new PocketBase client instance (options as for CRMPocketBase)."""
+    return CRMPocketBase(url, **options)
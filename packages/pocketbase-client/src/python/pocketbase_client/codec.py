@@ -0,0 +1,114 @@
+"""
+JSON decoding backends.
+
+Response bodies are decoded with msgspec or orjson when one is installed and
+with the stdlib json module otherwise. List pages can also be decoded straight
+into the slotted record structs (ColdCallStruct, LeadStruct, EventLogStruct):
+
+    for call in pb.iter_cold_calls(struct=ColdCallStruct):
+        print(call.call_outcome, call.objections)
+"""
+
+import json
+import dataclasses
+from functools import lru_cache
+from typing import Optional, Dict, List, Any, FrozenSet, Tuple, Type, TypeVar
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Backends in order of preference
+JSON_BACKENDS = ('msgspec', 'orjson', 'json')
+
+T = TypeVar('T')
+
+
+def available_backends() -> Tuple[str, ...]:
+    """Names of the JSON backends importable in this environment."""
+    installed = {'msgspec': msgspec is not None, 'orjson': orjson is not None, 'json': True}
+    return tuple(name for name in JSON_BACKENDS if installed[name])
+
+
+@lru_cache(maxsize=None)
+def struct_fields(struct: type) -> Tuple[str, ...]:
+    """Field names of a record struct (any dataclass), in declaration order."""
+    return tuple(field.name for field in dataclasses.fields(struct))
+
+
+@lru_cache(maxsize=None)
+def _field_set(struct: type) -> FrozenSet[str]:
+    return frozenset(struct_fields(struct))
+
+
+def to_struct(record: Dict[str, Any], struct: Type[T]) -> T:
+    """Build a struct from a record dict, dropping fields it does not declare."""
+    names = _field_set(struct)
+    return struct(**{key: value for key, value in record.items() if key in names})
+
+
+class JSONDecoder:
+    """
+    Decodes PocketBase response bodies.
+
+    backend: 'msgspec', 'orjson' or 'json'; defaults to the first installed
+    one in that order. Raises ValueError if the requested backend is missing.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        available = available_backends()
+        if backend is None:
+            backend = available[0]
+        elif backend not in available:
+            raise ValueError(f"JSON backend {backend!r} is not installed (available: {', '.join(available)})")
+        self.backend = backend
+        if backend == 'msgspec':
+            self._loads = msgspec.json.Decoder().decode
+        elif backend == 'orjson':
+            self._loads = orjson.loads
+        else:
+            self._loads = json.loads
+        # Typed page decoders built on demand (msgspec only), keyed by struct
+        self._page_decoders: Dict[type, Any] = {}
+
+    def decode(self, content: bytes) -> Any:
+        """Decode a response body into plain dicts and lists."""
+        return self._loads(content)
+
+    def decode_items(self, content: bytes, struct: Type[T]) -> List[T]:
+        """
+        Decode the items of a list response into struct instances.
+
+        With msgspec the page is decoded directly into the structs, without
+        building an intermediate dict per record. Other backends decode to
+        dicts first and copy them, which is slower than keeping the dicts;
+        the structs then only save memory. A page that does not match the
+        struct's types (e.g. after a schema change) falls back to the dict
+        path, so every backend returns the same data.
+        """
+        if self.backend == 'msgspec':
+            decoder = self._page_decoders.get(struct)
+            if decoder is None:
+                page = msgspec.defstruct(
+                    f'{struct.__name__}Page',
+                    [('items', List[struct], msgspec.field(default_factory=list))]
+                )
+                decoder = self._page_decoders[struct] = msgspec.json.Decoder(page)
+            try:
+                return decoder.decode(content).items
+            except msgspec.ValidationError:
+                pass
+        return [to_struct(record, struct) for record in self._loads(content).get('items', [])]
+
+    def __repr__(self) -> str:
+        return f'JSONDecoder(backend={self.backend!r})'
+
+
+DEFAULT_DECODER = JSONDecoder()
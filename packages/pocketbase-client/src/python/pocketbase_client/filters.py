@@ -0,0 +1,225 @@
+"""
+Filter expression builder.
+
+Builds PocketBase filter strings with values escaped, e.g.
+
+    (F.username == name) & (F.status != 'Cold No Reply')
+"""
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional, List, Any, Iterator, Sequence, Tuple, Union
+
+
+class Param:
+    """Named placeholder in a prepared filter, filled in at render time."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f'Param({self.name!r})'
+
+
+def quote_value(value: Any) -> str:
+    """Render a Python value as a PocketBase filter literal."""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        value = value.isoformat(sep=' ', timespec='milliseconds') + 'Z'
+    # Backslashes first, so the one escaping a quote is not doubled
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class Expr:
+    """
+    A filter expression built from F, e.g.
+
+        (F.username == name) & (F.status != 'Excluded')
+
+    str(expr) renders it with every value escaped. Combine with & (&&) and
+    | (||). Rendering goes through a cached template per expression shape,
+    so repeating the same query with new values only substitutes them.
+    """
+
+    def __and__(self, other: 'Expr') -> 'Expr':
+        return _Group('&&', [self, other])
+
+    def __or__(self, other: 'Expr') -> 'Expr':
+        return _Group('||', [self, other])
+
+    def _shape(self) -> tuple:
+        raise NotImplementedError
+
+    def _values(self) -> List[Any]:
+        raise NotImplementedError
+
+    def render(self, **params: Any) -> str:
+        """Render the filter, filling Param placeholders from params."""
+        values = (
+            quote_value(params[v.name] if isinstance(v, Param) else v)
+            for v in self._values()
+        )
+        return _fill(_filter_template(self._shape()), values)
+
+    def prepare(self) -> 'PreparedFilter':
+        """Compile once for reuse with different Param values."""
+        return PreparedFilter(self)
+
+    def __str__(self) -> str:
+        return self.render()
+
+
+class _Condition(Expr):
+    __slots__ = ('field', 'op', 'value')
+
+    def __init__(self, field: str, op: str, value: Any):
+        self.field = field
+        self.op = op
+        self.value = value
+
+    def _shape(self) -> tuple:
+        return ('c', self.field, self.op)
+
+    def _values(self) -> List[Any]:
+        return [self.value]
+
+
+class _Group(Expr):
+    __slots__ = ('op', 'parts')
+
+    def __init__(self, op: str, parts: List[Expr]):
+        if not parts:
+            raise ValueError('Cannot build a filter group without conditions')
+        self.op = op
+        # Flatten a || b || c into one group instead of nesting parentheses
+        self.parts = []
+        for part in parts:
+            if isinstance(part, _Group) and part.op == op:
+                self.parts.extend(part.parts)
+            else:
+                self.parts.append(part)
+
+    def _shape(self) -> tuple:
+        return ('g', self.op, tuple(p._shape() for p in self.parts))
+
+    def _values(self) -> List[Any]:
+        return [v for p in self.parts for v in p._values()]
+
+
+@lru_cache(maxsize=512)
+def _filter_template(shape: tuple) -> Tuple[Optional[str], ...]:
+    """Literal chunks of a rendered expression, with None where values go."""
+    chunks: List[Optional[str]] = []
+
+    def walk(node: tuple) -> None:
+        if node[0] == 'c':
+            chunks.append(f'{node[1]} {node[2]} ')
+            chunks.append(None)
+            return
+        chunks.append('(')
+        for i, part in enumerate(node[2]):
+            if i:
+                chunks.append(f' {node[1]} ')
+            walk(part)
+        chunks.append(')')
+
+    walk(shape)
+    merged: List[Optional[str]] = []
+    for chunk in chunks:
+        if chunk is not None and merged and merged[-1] is not None:
+            merged[-1] += chunk
+        else:
+            merged.append(chunk)
+    return tuple(merged)
+
+
+def _fill(template: Tuple[Optional[str], ...], quoted: Iterator[str]) -> str:
+    """Join a template's literal chunks with already-quoted values."""
+    return ''.join(chunk if chunk is not None else next(quoted) for chunk in template)
+
+
+class PreparedFilter:
+    """
+    A compiled filter whose Param placeholders are filled per call.
+
+    The template and every constant value are quoted once, here; a call
+    only quotes its parameters and joins the pieces.
+    """
+
+    def __init__(self, expr: Expr):
+        self.expr = expr
+        self.template = _filter_template(expr._shape())
+        # Param placeholders stay as-is; constants are stored pre-quoted
+        self._values = [v if isinstance(v, Param) else quote_value(v) for v in expr._values()]
+
+    def __call__(self, **params: Any) -> str:
+        quoted = (quote_value(params[v.name]) if isinstance(v, Param) else v for v in self._values)
+        return _fill(self.template, quoted)
+
+
+class Field:
+    """A record field to compare against; obtained as F.<name> or F('a.b')."""
+
+    __slots__ = ('name',)
+    __hash__ = None
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __eq__(self, value: Any) -> Expr:  # type: ignore[override]
+        return _Condition(self.name, '=', value)
+
+    def __ne__(self, value: Any) -> Expr:  # type: ignore[override]
+        return _Condition(self.name, '!=', value)
+
+    def __gt__(self, value: Any) -> Expr:
+        return _Condition(self.name, '>', value)
+
+    def __ge__(self, value: Any) -> Expr:
+        return _Condition(self.name, '>=', value)
+
+    def __lt__(self, value: Any) -> Expr:
+        return _Condition(self.name, '<', value)
+
+    def __le__(self, value: Any) -> Expr:
+        return _Condition(self.name, '<=', value)
+
+    def contains(self, value: Any) -> Expr:
+        """Field contains the value (`~`, a LIKE match)."""
+        return _Condition(self.name, '~', value)
+
+    def not_contains(self, value: Any) -> Expr:
+        return _Condition(self.name, '!~', value)
+
+    def any_eq(self, value: Any) -> Expr:
+        """Any item of a multi-valued field equals the value (`?=`)."""
+        return _Condition(self.name, '?=', value)
+
+    def in_(self, values: Sequence[Any]) -> Expr:
+        """Field equals one of the values, as a single `||` group."""
+        return _Group('||', [_Condition(self.name, '=', v) for v in values])
+
+
+class _FieldFactory:
+    def __getattr__(self, name: str) -> Field:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return Field(name)
+
+    def __call__(self, name: str) -> Field:
+        return Field(name)
+
+
+F = _FieldFactory()
+
+# Anything accepted where a filter is expected
+FilterLike = Union[str, Expr]
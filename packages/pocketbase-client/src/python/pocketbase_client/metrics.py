@@ -0,0 +1,226 @@
+"""
+Request hooks and metrics.
+
+Both clients call their pre_request_hooks before each HTTP attempt and their
+post_request_hooks with a RequestEvent after it. Metrics is a ready-made
+post hook that aggregates those events per endpoint:
+
+    metrics = Metrics()
+    metrics.attach(pb)
+    ...
+    print(metrics.to_prometheus())
+"""
+
+import json
+import bisect
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Any, Callable, Sequence, Tuple
+
+from .query import _RECORD_ENDPOINT
+
+logger = logging.getLogger(__name__)
+
+
+# Latency histogram bucket bounds in seconds (Prometheus client defaults)
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Called with (method, endpoint, headers) before each attempt; may add headers
+PreRequestHook = Callable[[str, str, Dict[str, str]], None]
+
+
+@dataclass(slots=True)
+class RequestEvent:
+    """One HTTP attempt, as passed to post-request hooks."""
+    method: str
+    endpoint: str
+    status_code: Optional[int]  # None if no response was received
+    elapsed: float  # Seconds
+    bytes_sent: int
+    bytes_received: int
+    attempt: int  # 0 for the first try, >0 for retries and re-auth repeats
+    error: Optional[BaseException] = None
+
+
+PostRequestHook = Callable[[RequestEvent], None]
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Endpoint with record IDs replaced, so requests group per collection."""
+    match = _RECORD_ENDPOINT.match(endpoint)
+    if match and match.group(2):
+        return f'/collections/{match.group(1)}/records/:id'
+    return endpoint
+
+
+class _EndpointStats:
+    __slots__ = ('buckets', 'count', 'total', 'statuses', 'bytes_sent', 'bytes_received', 'retries', 'errors')
+
+    def __init__(self, bounds: int):
+        self.buckets = [0] * (bounds + 1)  # Last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.statuses: Dict[str, int] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.errors = 0
+
+
+class Metrics:
+    """
+    Thread-safe per-endpoint request metrics.
+
+    Records a latency histogram, request/response bytes, status codes,
+    retries and transport errors per (method, endpoint). Attached clients'
+    cache hit/miss counters are included in the exports.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, prefix: str = 'pocketbase'):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._stats: Dict[Tuple[str, str], _EndpointStats] = {}
+        self._caches: List[Any] = []
+        self._lock = threading.Lock()
+
+    def attach(self, client: Any) -> 'Metrics':
+        """Register as a post-request hook on a (sync or async) client."""
+        client.post_request_hooks.append(self.record)
+        cache = getattr(client, 'cache', None)
+        if cache is not None and hasattr(cache, 'stats') and all(c is not cache for c in self._caches):
+            self._caches.append(cache)
+        return self
+
+    def record(self, event: RequestEvent) -> None:
+        """Add one request event."""
+        key = (event.method, endpoint_label(event.endpoint))
+        status = str(event.status_code) if event.status_code is not None else 'error'
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _EndpointStats(len(self.buckets))
+            stats.buckets[bisect.bisect_left(self.buckets, event.elapsed)] += 1
+            stats.count += 1
+            stats.total += event.elapsed
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.bytes_sent += event.bytes_sent
+            stats.bytes_received += event.bytes_received
+            if event.attempt:
+                stats.retries += 1
+            if event.error is not None:
+                stats.errors += 1
+
+    def reset(self) -> None:
+        """Drop all recorded request metrics."""
+        with self._lock:
+            self._stats.clear()
+
+    def _cache_stats(self) -> Dict[str, Dict[str, int]]:
+        collections: Dict[str, Dict[str, int]] = {}
+        for cache in self._caches:
+            for name, counts in cache.stats().get('collections', {}).items():
+                totals = collections.setdefault(name, {'hits': 0, 'misses': 0})
+                totals['hits'] += counts.get('hits', 0)
+                totals['misses'] += counts.get('misses', 0)
+        return collections
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable view of all metrics."""
+        with self._lock:
+            endpoints = []
+            for (method, endpoint), stats in sorted(self._stats.items(), key=lambda item: (item[0][1], item[0][0])):
+                cumulative, histogram = 0, {}
+                for bound, n in zip([*self.buckets, float('inf')], stats.buckets):
+                    cumulative += n
+                    histogram['+Inf' if bound == float('inf') else repr(bound)] = cumulative
+                endpoints.append({
+                    'method': method,
+                    'endpoint': endpoint,
+                    'count': stats.count,
+                    'latency_sum': stats.total,
+                    'latency_avg': stats.total / stats.count if stats.count else 0.0,
+                    'latency_buckets': histogram,
+                    'statuses': dict(stats.statuses),
+                    'bytes_sent': stats.bytes_sent,
+                    'bytes_received': stats.bytes_received,
+                    'retries': stats.retries,
+                    'errors': stats.errors,
+                })
+        return {'endpoints': endpoints, 'cache': self._cache_stats()}
+
+    def to_json(self, **kwargs) -> str:
+        """snapshot() as a JSON string (kwargs are passed to json.dumps)."""
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        p = self.prefix
+        snapshot = self.snapshot()
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f'# HELP {p}_{name} {help_text}')
+            lines.append(f'# TYPE {p}_{name} {kind}')
+
+        def labels(**values: str) -> str:
+            return ','.join(f'{k}="{_escape_label(v)}"' for k, v in values.items())
+
+        family('request_duration_seconds', 'histogram', 'PocketBase request latency in seconds.')
+        for e in snapshot['endpoints']:
+            base = labels(method=e['method'], endpoint=e['endpoint'])
+            for le, n in e['latency_buckets'].items():
+                lines.append(f'{p}_request_duration_seconds_bucket{{{base},le="{le}"}} {n}')
+            lines.append(f'{p}_request_duration_seconds_sum{{{base}}} {e["latency_sum"]}')
+            lines.append(f'{p}_request_duration_seconds_count{{{base}}} {e["count"]}')
+
+        family('requests_total', 'counter', 'PocketBase requests by status code ("error" if none).')
+        for e in snapshot['endpoints']:
+            for status, n in sorted(e['statuses'].items()):
+                lines.append(f'{p}_requests_total{{{labels(method=e["method"], endpoint=e["endpoint"], status=status)}}} {n}')
+
+        for name, key, help_text in (
+            ('request_bytes_total', 'bytes_sent', 'Request body bytes sent.'),
+            ('response_bytes_total', 'bytes_received', 'Response body bytes received.'),
+            ('request_retries_total', 'retries', 'Repeated attempts (retries and re-auth).'),
+        ):
+            family(name, 'counter', help_text)
+            for e in snapshot['endpoints']:
+                lines.append(f'{p}_{name}{{{labels(method=e["method"], endpoint=e["endpoint"])}}} {e[key]}')
+
+        for name, key in (('cache_hits_total', 'hits'), ('cache_misses_total', 'misses')):
+            family(name, 'counter', f'Lookup cache {key} per collection.')
+            for collection, counts in sorted(snapshot['cache'].items()):
+                lines.append(f'{p}_{name}{{{labels(collection=collection)}}} {counts[key]}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _request_event(
+    method: str,
+    endpoint: str,
+    response: Any,
+    error: Optional[BaseException],
+    elapsed: float,
+    attempt: int
+) -> RequestEvent:
+    """Build the RequestEvent for one attempt (response is an httpx.Response or None)."""
+    if response is None:
+        return RequestEvent(method, endpoint, None, elapsed, 0, 0, attempt, error)
+    return RequestEvent(
+        method, endpoint, response.status_code, elapsed,
+        len(response.request.content), len(response.content), attempt, error
+    )
+
+
+def _call_hooks(hooks: List[Callable[..., None]], *args: Any) -> None:
+    """Run hooks in order; a failing hook is logged and does not fail the request."""
+    for hook in hooks:
+        try:
+            hook(*args)
+        except Exception:
+            logger.exception(f"Request hook {hook!r} failed")
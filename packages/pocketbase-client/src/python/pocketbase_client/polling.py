@@ -0,0 +1,186 @@
+"""
+Incremental (delta) polling of list queries.
+
+A DeltaQuery keeps the result set of one list query and, after the first full
+load, only asks PocketBase for records created or updated since the last poll:
+
+    goals = pb.get_active_goals(incremental=True)  # full load
+    goals = pb.get_active_goals(incremental=True)  # delta: usually 0 records
+
+The clients drive the requests (CRMPocketBase.poll / AsyncCRMPocketBase.poll);
+this module only holds the state and builds the queries.
+"""
+
+import time
+import threading
+from datetime import timedelta
+from typing import Optional, Dict, List, Any, Iterable, Sequence
+
+from .filters import F, FilterLike
+from .query import FieldSpec, _query_params, _pb_timestamp, _parse_pb_timestamp
+
+
+# Seconds between full reloads, which pick up deleted records
+DEFAULT_RESYNC_INTERVAL = 300.0
+
+# Delta queries re-read this many seconds before the watermark, so records
+# committed slightly out of timestamp order are not skipped
+DELTA_OVERLAP = 1.0
+
+
+def _sort_key(sort: str):
+    """Key function for a PocketBase sort string such as '-created,name'."""
+    fields = [(f[1:], True) if f.startswith('-') else (f.lstrip('+'), False)
+              for f in (part.strip() for part in sort.split(',')) if f]
+
+    class Key:
+        __slots__ = ('record',)
+
+        def __init__(self, record: Dict):
+            self.record = record
+
+        def __lt__(self, other: 'Key') -> bool:
+            for name, descending in fields:
+                a, b = self.record.get(name), other.record.get(name)
+                if a == b:
+                    continue
+                if a is None or b is None:
+                    return (a is None) != descending
+                return (a > b) if descending else (a < b)
+            return False
+
+    return Key
+
+
+class DeltaQuery:
+    """
+    The maintained result set of one list query.
+
+    The first poll (and one every resync_interval seconds) loads the full
+    result. Later polls fetch records with `created` or `updated` at or
+    after the watermark (the newest of either seen so far; `updated` stays
+    empty until a record is first edited) and merge them in. With a filter,
+    a second `fields=id` request lists every record changed since the
+    watermark, so records that stopped matching (e.g. a goal that is no
+    longer Active) are dropped. Deleted records disappear at the next full
+    reload.
+
+    Records with none of the watermark fields (collections without
+    autodates) are reloaded in full on every poll. With a limit, only the
+    first `limit` records in `sort` order are kept.
+    """
+
+    def __init__(
+        self,
+        collection: str,
+        filter_str: Optional[FilterLike] = None,
+        sort: Optional[str] = None,
+        fields: Optional[FieldSpec] = None,
+        expand: Optional[FieldSpec] = None,
+        limit: Optional[int] = None,
+        watermark_fields: Sequence[str] = ('created', 'updated'),
+        resync_interval: Optional[float] = DEFAULT_RESYNC_INTERVAL
+    ):
+        self.collection = collection
+        self.filter_str = str(filter_str) if filter_str is not None else None
+        self.sort = sort
+        self.limit = limit
+        self.watermark_fields = tuple(watermark_fields)
+        self.resync_interval = resync_interval
+        if fields:
+            names = fields.split(',') if isinstance(fields, str) else list(fields)
+            fields = [*names, *(f for f in ('id', *self.watermark_fields) if f not in names)]
+        self.fields = fields
+        self.expand = expand
+        self.watermark: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.delta_supported = True
+        self._records: Dict[str, Dict] = {}
+        self._truncated = False
+        self.lock = threading.Lock()
+
+    def needs_full_load(self) -> bool:
+        """Whether the next poll must reload the whole result set."""
+        if self.loaded_at is None or not self.delta_supported or self.watermark is None:
+            return True
+        return self.resync_interval is not None and time.monotonic() - self.loaded_at >= self.resync_interval
+
+    def full_params(self) -> Dict[str, Any]:
+        """Query parameters of the full load."""
+        return _query_params(self.filter_str, self.sort, self.fields, self.expand)
+
+    def _since(self) -> str:
+        since = _parse_pb_timestamp(self.watermark) - timedelta(seconds=DELTA_OVERLAP)
+        since = _pb_timestamp(since)
+        expr = F(self.watermark_fields[0]) >= since
+        for field in self.watermark_fields[1:]:
+            expr = expr | (F(field) >= since)
+        return str(expr)
+
+    def delta_params(self) -> Dict[str, Any]:
+        """Query parameters for the matching records changed since the watermark."""
+        since = self._since()
+        filter_str = since if self.filter_str is None else f'({self.filter_str}) && {since}'
+        # Sorted by id, which never changes, so records do not shift between pages
+        return _query_params(filter_str, 'id', self.fields, self.expand)
+
+    def touched_params(self) -> Optional[Dict[str, Any]]:
+        """IDs of every record changed since the watermark (None without a filter)."""
+        if self.filter_str is None:
+            return None
+        return _query_params(self._since(), fields='id')
+
+    def load(self, records: Iterable[Dict]) -> None:
+        """Replace the result set with a full load."""
+        self._records = {}
+        self.watermark = None
+        self.delta_supported = True
+        self._absorb(records)
+        self._truncated = self.limit is not None and len(self._records) >= self.limit
+        self.loaded_at = time.monotonic()
+
+    def merge(self, changed: Iterable[Dict], touched_ids: Optional[Iterable[str]] = None) -> None:
+        """Apply a delta: upsert changed records, drop touched ones that no longer match."""
+        changed = list(changed)
+        if touched_ids is not None:
+            matching = {record['id'] for record in changed}
+            dropped = [r for r in set(touched_ids) - matching if self._records.pop(r, None) is not None]
+            if dropped and self._truncated:
+                # Records beyond the limit may now belong in the result
+                self.loaded_at = None
+        self._absorb(changed)
+
+    def _absorb(self, records: Iterable[Dict]) -> None:
+        for record in records:
+            self._records[record['id']] = record
+            mark = max((record.get(f) or '' for f in self.watermark_fields), default='')
+            if not mark:
+                self.delta_supported = False
+            elif self.watermark is None or mark > self.watermark:
+                self.watermark = mark
+        if self.limit is not None and len(self._records) > self.limit:
+            self._records = {r['id']: r for r in self.records()}
+
+    def records(self) -> List[Dict]:
+        """The current result set, in the query's sort order."""
+        records = list(self._records.values())
+        if self.sort:
+            records.sort(key=_sort_key(self.sort))
+        return records[:self.limit] if self.limit is not None else records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+def _delta_key(
+    collection: str,
+    filter_str: Optional[FilterLike],
+    sort: Optional[str],
+    fields: Optional[FieldSpec],
+    expand: Optional[FieldSpec],
+    limit: Optional[int]
+) -> tuple:
+    """Identity of a list query, for reusing its DeltaQuery across polls."""
+    def spec(value: Optional[FieldSpec]) -> Optional[str]:
+        return value if value is None or isinstance(value, str) else ','.join(value)
+    return (collection, None if filter_str is None else str(filter_str), sort, spec(fields), spec(expand), limit)
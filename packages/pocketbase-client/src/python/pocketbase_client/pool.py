@@ -0,0 +1,71 @@
+"""
+Connection pooling: httpx client options and the process-wide shared clients.
+"""
+
+import atexit
+import threading
+from typing import Optional, Dict, Any, Union
+
+import httpx
+
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+# httpx.Client instances shared across CRMPocketBase objects, keyed by options
+_SHARED_CLIENTS: Dict[tuple, httpx.Client] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+def _http_client_options(
+    timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+    max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = False
+) -> Dict[str, Any]:
+    """Build httpx client keyword arguments from the pool/timeout options."""
+    return {
+        'timeout': timeout if isinstance(timeout, httpx.Timeout) else httpx.Timeout(timeout),
+        'limits': httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        'http2': http2,
+    }
+
+
+def shared_http_client(**options) -> httpx.Client:
+    """
+    Get the process-wide httpx.Client for the given pool/timeout options.
+
+    Accepts the same keyword arguments as the CRMPocketBase connection options.
+    Clients are created on first use and kept open so later callers reuse warm
+    (already TLS-negotiated) connections; see close_shared_clients().
+    """
+    kwargs = _http_client_options(**options)
+    timeout, limits = kwargs['timeout'], kwargs['limits']
+    key = (
+        timeout.connect, timeout.read, timeout.write, timeout.pool,
+        limits.max_connections, limits.max_keepalive_connections, limits.keepalive_expiry,
+        kwargs['http2'],
+    )
+    with _SHARED_CLIENTS_LOCK:
+        client = _SHARED_CLIENTS.get(key)
+        if client is None or client.is_closed:
+            client = _SHARED_CLIENTS[key] = httpx.Client(**kwargs)
+        return client
+
+
+def close_shared_clients() -> None:
+    """Close every shared httpx.Client (also run automatically at exit)."""
+    with _SHARED_CLIENTS_LOCK:
+        for client in _SHARED_CLIENTS.values():
+            client.close()
+        _SHARED_CLIENTS.clear()
+
+
+atexit.register(close_shared_clients)
@@ -0,0 +1,107 @@
+"""
+Query-string helpers shared by the sync and async clients.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Any, Iterator, Sequence, Tuple, Union
+from urllib.parse import quote as quote_url
+
+from .filters import Expr, FilterLike, _Condition, _Group, quote_value
+
+
+# Record endpoints: /collections/{name}/records[/{id}]
+_RECORD_ENDPOINT = re.compile(r'^/collections/([^/]+)/records(?:/([^/]+))?$')
+
+# Page size used by the iter_* methods (PocketBase caps perPage at 1000)
+DEFAULT_PER_PAGE = 200
+
+# A comma-separated string or a list of field / relation names
+FieldSpec = Union[str, Sequence[str]]
+
+
+def _query_params(
+    filter_str: Optional[FilterLike] = None,
+    sort: Optional[str] = None,
+    fields: Optional[FieldSpec] = None,
+    expand: Optional[FieldSpec] = None
+) -> Dict[str, Any]:
+    """
+    Build record query params, leaving out unset options.
+
+    `fields` limits the returned fields (e.g. 'id,company_name' or
+    'id,expand.company.company_name'); `expand` resolves relations in the same
+    request. When both are given and `fields` does not mention `expand`, it is
+    added so the expanded records are not projected away.
+    """
+    params: Dict[str, Any] = {}
+    if sort:
+        params['sort'] = sort
+    if filter_str:
+        params['filter'] = str(filter_str)
+    if expand:
+        params['expand'] = expand if isinstance(expand, str) else ','.join(expand)
+    if fields:
+        names = [f.strip() for f in (fields.split(',') if isinstance(fields, str) else fields)]
+        if expand and not any(f == '*' or f.startswith('expand') for f in names):
+            names.append('expand')
+        params['fields'] = ','.join(names)
+    return params
+
+
+# Longest URL-encoded filter a find_*_by_* bulk lookup puts in one request
+MAX_FILTER_LENGTH = 4000
+
+
+def _chunk_filters(field: str, op: str, values: Sequence[Any], max_length: int = MAX_FILTER_LENGTH) -> Iterator[Tuple[List[Any], Expr]]:
+    """
+    Split values into `field op v1 || field op v2 ...` filters whose
+    URL-encoded form stays under max_length. Yields (values, filter) pairs.
+    """
+    chunk: List[Any] = []
+    length = 0
+    for value in values:
+        # Each term costs its encoded text plus the encoded ' || ' separator
+        term = len(quote_url(f'{field} {op} {quote_value(value)}')) + len(quote_url(' || '))
+        if chunk and length + term > max_length:
+            yield chunk, _Group('||', [_Condition(field, op, v) for v in chunk])
+            chunk, length = [], 0
+        chunk.append(value)
+        length += term
+    if chunk:
+        yield chunk, _Group('||', [_Condition(field, op, v) for v in chunk])
+
+
+def _record_matches(record: Dict, field: str, op: str, value: Any) -> bool:
+    """Whether a record satisfies a `field op value` lookup ('=' or '~')."""
+    if op == '=':
+        return record.get(field) == value
+    return str(value).lower() in str(record.get(field) or '').lower()
+
+
+def _match_lookup(records: List[Dict], field: str, op: str, values: List[Any]) -> Dict[Any, Dict]:
+    """Map each looked-up value to the first record it matches."""
+    found: Dict[Any, Dict] = {}
+    for record in records:
+        for value in values:
+            if value not in found and _record_matches(record, field, op, value):
+                found[value] = record
+    return found
+
+
+def _lookup_key(field: str, value: Any, params: Dict[str, Any], op: str = '=') -> tuple:
+    """Cache key for a single-record lookup; projections get their own entry."""
+    if 'fields' in params or 'expand' in params:
+        return (field, op, value, params.get('fields'), params.get('expand'))
+    return (field, op, value)
+
+
+def _pb_timestamp(value: Optional[datetime] = None) -> str:
+    """Format a datetime the way PocketBase stores `created`/`updated`."""
+    value = value or datetime.now(timezone.utc)
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.') + f'{value.microsecond // 1000:03d}Z'
+
+
+def _parse_pb_timestamp(value: str) -> datetime:
+    """Inverse of _pb_timestamp (also accepts the ISO 'T' separator)."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00').replace(' ', 'T', 1))
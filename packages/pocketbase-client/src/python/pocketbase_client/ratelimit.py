@@ -0,0 +1,164 @@
+"""
+Client-side rate limiting.
+
+One RateLimiter can be shared by any number of sync and async clients (and
+the threads/tasks using them), so a parallel backfill stays under the
+server's limits instead of tripping 429s and retry storms:
+
+    limiter = RateLimiter()
+    pb = CRMPocketBase(rate_limiter=limiter)
+    apb = AsyncCRMPocketBase(rate_limiter=limiter)
+"""
+
+import time
+import asyncio
+import threading
+from typing import Optional, Dict, Tuple
+
+import httpx
+
+from .retry import _parse_retry_after, _is_auth_endpoint
+
+
+# (requests per second, burst) per endpoint class, after PocketBase's default
+# rate limit rules: *:auth 2/3s, *:create 20/5s and /api/ 300/10s
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    'auth': (2 / 3, 2),
+    'list': (30.0, 300),
+    'write': (4.0, 20),
+}
+
+# On a 429 the rate is multiplied by this (and recovers gradually afterwards)
+RATE_LIMIT_BACKOFF = 0.5
+
+# Pause applied to a class after a 429 without a Retry-After header
+RATE_LIMIT_PENALTY = 1.0
+
+# Fraction of the configured rate regained per second without 429s
+RATE_LIMIT_RECOVERY = 0.05
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that adapts its rate to 429 responses.
+
+    Requests are spaced `1 / rate` seconds apart, with up to `burst` sent
+    back to back after an idle spell (implemented as a virtual schedule, so
+    callers reserve a send time instead of polling). A 429 halves the
+    current rate (RATE_LIMIT_BACKOFF), pauses the bucket for the Retry-After
+    delay and invalidates reservations made before it; while requests
+    succeed the rate climbs back by RATE_LIMIT_RECOVERY of the configured
+    rate per second, so a shared bucket settles just under the server's
+    limit.
+    """
+
+    def __init__(self, rate: float, burst: float, min_rate: Optional[float] = None):
+        if rate <= 0 or burst < 1:
+            raise ValueError('rate must be positive and burst at least 1')
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 20
+        self.burst = burst
+        self.epoch = 0  # Bumped by every 429; stale reservations must be renewed
+        self._next = time.monotonic()  # Earliest send time once the burst is used up
+        self._paused_until = 0.0
+        self._recovered_at = self._next
+        self._lock = threading.Lock()
+
+    def reserve(self) -> Tuple[float, int]:
+        """Reserve a send slot: (seconds to wait first, epoch of the reservation)."""
+        with self._lock:
+            now = time.monotonic()
+            interval = 1.0 / self.rate
+            slot = max(self._next, now)
+            self._next = slot + interval
+            return max(0.0, slot - (self.burst - 1) * interval - now), self.epoch
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """React to a 429: slow down and pause for retry_after seconds."""
+        with self._lock:
+            now = time.monotonic()
+            # Requests already in flight often get 429s together; count them as one
+            if now >= self._paused_until:
+                self.rate = max(self.min_rate, self.rate * RATE_LIMIT_BACKOFF)
+            pause = retry_after if retry_after is not None else RATE_LIMIT_PENALTY
+            self._paused_until = max(self._paused_until, now + pause)
+            self._recovered_at = self._paused_until
+            # Restart the schedule after the pause, paced rather than in a burst
+            self._next = self._paused_until + (self.burst - 1) / self.rate
+            self.epoch += 1
+
+    def recover(self) -> None:
+        """Note a successful request, moving the rate back toward max_rate."""
+        if self.rate < self.max_rate:
+            with self._lock:
+                now = time.monotonic()
+                if now > self._recovered_at:
+                    regained = self.max_rate * RATE_LIMIT_RECOVERY * (now - self._recovered_at)
+                    self.rate = min(self.max_rate, self.rate + regained)
+                    self._recovered_at = now
+
+
+class RateLimiter:
+    """
+    Token buckets per endpoint class: 'auth' (auth-with-password and
+    refreshes), 'list' (reads) and 'write' (everything else, batches
+    included). limits maps a class to (requests per second, burst); classes
+    left out are not limited.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        limits = DEFAULT_RATE_LIMITS if limits is None else limits
+        self.buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(rate, burst) for name, (rate, burst) in limits.items()
+        }
+
+    @staticmethod
+    def classify(method: str, endpoint: str) -> str:
+        """Endpoint class of a request."""
+        if _is_auth_endpoint(endpoint):
+            return 'auth'
+        return 'list' if method in ('GET', 'HEAD') else 'write'
+
+    def _bucket(self, method: str, endpoint: str) -> Optional[TokenBucket]:
+        return self.buckets.get(self.classify(method, endpoint))
+
+    def acquire(self, method: str, endpoint: str) -> None:
+        """Block the calling thread until the request may be sent."""
+        bucket = self._bucket(method, endpoint)
+        if bucket is not None:
+            while True:
+                delay, epoch = bucket.reserve()
+                if delay > 0:
+                    time.sleep(delay)
+                # A 429 while waiting rescheduled everything; queue again
+                if bucket.epoch == epoch:
+                    return
+
+    async def acquire_async(self, method: str, endpoint: str) -> None:
+        """Wait (without blocking the event loop) until the request may be sent."""
+        bucket = self._bucket(method, endpoint)
+        if bucket is not None:
+            while True:
+                delay, epoch = bucket.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if bucket.epoch == epoch:
+                    return
+
+    def update(self, method: str, endpoint: str, response: Optional[httpx.Response]) -> None:
+        """Feed a response back so the bucket adapts to 429s."""
+        bucket = self._bucket(method, endpoint)
+        if bucket is None or response is None:
+            return
+        if response.status_code == 429:
+            bucket.throttle(_parse_retry_after(response.headers.get('Retry-After')))
+        elif response.status_code < 400:
+            bucket.recover()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Current and configured rate per endpoint class."""
+        return {
+            name: {'rate': bucket.rate, 'max_rate': bucket.max_rate, 'burst': bucket.burst}
+            for name, bucket in self.buckets.items()
+        }
@@ -0,0 +1,291 @@
+"""
+Realtime (SSE) subscriptions.
+
+Only imported when CRMPocketBase.subscribe() is first called.
+"""
+
+import json
+import time
+import random
+import logging
+import threading
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Callable, Iterator, Tuple
+from urllib.parse import quote as quote_url
+
+import httpx
+
+from .filters import F, Expr, FilterLike
+from .query import _pb_timestamp
+
+if TYPE_CHECKING:
+    from .client import CRMPocketBase
+
+logger = logging.getLogger(__name__)
+
+
+# Longest wait between realtime reconnect attempts after errors
+REALTIME_MAX_BACKOFF = 30.0
+
+# Shortest wait before any reconnect, even after a clean close
+REALTIME_MIN_RECONNECT_DELAY = 0.5
+
+# A connection must stay up this long before the backoff resets; streams
+# closed sooner (e.g. by a misbehaving proxy) count as failures
+REALTIME_STABLE_AFTER = 30.0
+
+# Seconds to establish the realtime connection (reads wait indefinitely)
+REALTIME_CONNECT_TIMEOUT = 10.0
+
+
+def _iter_sse(lines: Iterator[str]) -> Iterator[Tuple[str, Any]]:
+    """Parse server-sent events into (event name, decoded JSON data) pairs."""
+    event, data = 'message', []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, json.loads('\n'.join(data))
+            event, data = 'message', []
+        elif not line.startswith(':'):
+            name, _, value = line.partition(':')
+            value = value[1:] if value.startswith(' ') else value
+            if name == 'event':
+                event = value
+            elif name == 'data':
+                data.append(value)
+
+
+class Subscription:
+    """
+    Handle returned by CRMPocketBase.subscribe().
+
+    `watermark` is the newest `created` or `updated` timestamp delivered so
+    far (`updated` is empty until a record is first edited); after a
+    reconnect, records created or changed since then are fetched and
+    delivered so no create/update is missed (deletes during the gap cannot
+    be recovered). Collections without these autodates (e.g. insta_actors)
+    cannot be caught up: catch_up_supported turns False once that is
+    detected, and changes made while disconnected are then lost.
+    """
+
+    def __init__(
+        self,
+        realtime: 'Realtime',
+        topic: str,
+        collection: str,
+        callback: Callable[[str, Dict], Any],
+        filter_str: Optional[FilterLike] = None,
+        record_id: str = '*'
+    ):
+        self._realtime = realtime
+        self.topic = topic
+        self.collection = collection
+        self.callback = callback
+        self.filter_str = filter_str
+        self.record_id = record_id
+        self.watermark = _pb_timestamp()
+        self.catch_up_supported = True
+
+    def _deliver(self, action: str, record: Dict) -> None:
+        if action != 'delete' and record:
+            created, updated = record.get('created'), record.get('updated')
+            if created is None and updated is None:
+                self._disable_catch_up()
+            else:
+                self.watermark = max(self.watermark, created or '', updated or '')
+        try:
+            self.callback(action, record)
+        except Exception:
+            logger.exception(f"Realtime callback for {self.collection} failed")
+
+    def _disable_catch_up(self) -> None:
+        if self.catch_up_supported:
+            self.catch_up_supported = False
+            logger.warning(
+                f"{self.collection} has no `created`/`updated` fields; realtime changes missed "
+                f"while disconnected will not be recovered"
+            )
+
+    def _catch_up(self, client: 'CRMPocketBase') -> None:
+        """Deliver records changed while the connection was down."""
+        if not self.catch_up_supported:
+            return
+        expr: Expr = (F.created > self.watermark) | (F.updated > self.watermark)
+        if self.record_id != '*':
+            expr = (F.id == self.record_id) & expr
+        filter_str = str(expr) if self.filter_str is None else f'({self.filter_str}) && {expr}'
+        since = self.watermark
+        try:
+            records = list(client._iter_records(self.collection, {'filter': filter_str, 'sort': 'created'}))
+        except httpx.HTTPStatusError as e:
+            # PocketBase rejects filters and sorts on unknown fields with a 400
+            if e.response.status_code != 400:
+                raise
+            self._disable_catch_up()
+            return
+        records.sort(key=lambda r: max(r.get('created') or '', r.get('updated') or ''))
+        for record in records:
+            self._deliver('create' if record.get('created', '') > since else 'update', record)
+
+    def unsubscribe(self) -> None:
+        """Stop receiving events for this subscription."""
+        self._realtime._remove(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.unsubscribe()
+
+
+class Realtime:
+    """
+    One /api/realtime server-sent-events connection shared by every
+    subscription of a CRMPocketBase client.
+
+    Runs on a daemon thread, which is where callbacks are called. The
+    connection is opened on the first subscription, reconnects with jittered
+    backoff (resubmitting all topics and catching up on missed changes), and
+    is closed once the last subscription is removed.
+    """
+
+    def __init__(self, client: 'CRMPocketBase'):
+        self._client = client
+        self._lock = threading.RLock()
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self._client_id: Optional[str] = None
+        self._response: Optional[httpx.Response] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._connected_once = False
+
+    @property
+    def client_id(self) -> Optional[str]:
+        """Realtime client ID of the live connection, if connected."""
+        return self._client_id
+
+    def subscribe(
+        self,
+        collection: str,
+        callback: Callable[[str, Dict], Any],
+        filter_str: Optional[FilterLike] = None,
+        record_id: str = '*'
+    ) -> Subscription:
+        topic = f'{collection}/{record_id}'
+        if filter_str:
+            options = json.dumps({'query': {'filter': str(filter_str)}})
+            topic += '?options=' + quote_url(options, safe='')
+        subscription = Subscription(self, topic, collection, callback, filter_str, record_id)
+        with self._lock:
+            subscribers = self._subscriptions.setdefault(topic, [])
+            subscribers.append(subscription)
+            new_topic = len(subscribers) == 1
+            if self._thread is None or not self._thread.is_alive() or self._stop.is_set():
+                # A thread stopped by the last unsubscribe may still be winding
+                # down; it keeps its own (set) stop event, the new one gets a
+                # fresh event
+                self._stop = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop,), name='pocketbase-realtime', daemon=True)
+                self._thread.start()
+            elif new_topic:
+                self._submit_topics()
+        return subscription
+
+    def _remove(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.topic, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if subscribers:
+                return
+            self._subscriptions.pop(subscription.topic, None)
+            if self._subscriptions:
+                self._submit_topics()
+            else:
+                self.close()
+
+    def close(self) -> None:
+        """Drop every subscription and close the connection."""
+        with self._lock:
+            self._subscriptions.clear()
+            self._stop.set()
+            response = self._response
+        if response is not None:
+            response.close()
+
+    def _submit_topics(self) -> None:
+        """Tell the server the current topic list (no-op until connected)."""
+        with self._lock:
+            client_id = self._client_id
+            topics = list(self._subscriptions)
+        if client_id is None:
+            return
+        try:
+            self._client._request('POST', '/realtime', json={
+                'clientId': client_id,
+                'subscriptions': topics
+            })
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to submit realtime subscriptions: {e}")
+
+    def _on_connect(self, client_id: str) -> None:
+        with self._lock:
+            self._client_id = client_id
+            subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+        self._submit_topics()
+        if self._connected_once:
+            for subscription in subscriptions:
+                try:
+                    subscription._catch_up(self._client)
+                except httpx.HTTPError as e:
+                    logger.warning(f"Realtime catch-up for {subscription.collection} failed: {e}")
+        self._connected_once = True
+
+    def _dispatch(self, topic: str, data: Dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscriptions.get(topic, []))
+        for subscription in subscribers:
+            subscription._deliver(data.get('action', ''), data.get('record') or {})
+
+    def _run(self, stop: threading.Event) -> None:
+        delay = 1.0
+        while not stop.is_set():
+            connected_at = None
+            try:
+                with self._client._client.stream(
+                    'GET',
+                    f"{self._client.url}/api/realtime",
+                    headers=self._client._headers(),
+                    timeout=httpx.Timeout(REALTIME_CONNECT_TIMEOUT, read=None)
+                ) as response:
+                    response.raise_for_status()
+                    with self._lock:
+                        if stop.is_set():
+                            break
+                        self._response = response
+                    for event, data in _iter_sse(response.iter_lines()):
+                        if stop.is_set():
+                            break
+                        if event == 'PB_CONNECT':
+                            connected_at = time.monotonic()
+                            self._on_connect(data['clientId'])
+                        else:
+                            self._dispatch(event, data)
+            except Exception as e:
+                if stop.is_set():
+                    break
+                logger.warning(f"Realtime connection lost: {e}")
+            finally:
+                with self._lock:
+                    if self._stop is stop:
+                        self._response = None
+                        self._client_id = None
+            if connected_at is not None and time.monotonic() - connected_at >= REALTIME_STABLE_AFTER:
+                # A long-lived stream the server closed (it drops idle ones):
+                # reconnect promptly and start the backoff over
+                delay = 1.0
+                wait = random.uniform(REALTIME_MIN_RECONNECT_DELAY, 2 * REALTIME_MIN_RECONNECT_DELAY)
+            else:
+                wait = random.uniform(max(delay / 2, REALTIME_MIN_RECONNECT_DELAY), delay)
+                delay = min(delay * 2, REALTIME_MAX_BACKOFF)
+            stop.wait(wait)
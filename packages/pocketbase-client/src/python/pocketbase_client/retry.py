@@ -0,0 +1,125 @@
+"""
+Retry policy and token-expiry helpers.
+"""
+
+import json
+import time
+import base64
+import random
+from email.utils import parsedate_to_datetime
+from typing import Optional, Any, Sequence
+
+import httpx
+
+from .query import _RECORD_ENDPOINT
+
+
+# Refresh a stored-credentials token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = 60.0
+
+# Errors raised before the request reached the server; always safe to retry
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _token_expires_at(token: Optional[str]) -> Optional[float]:
+    """Read the exp claim of a PocketBase JWT without verifying it."""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried.
+
+    Transient failures (connection errors and the statuses in retry_statuses)
+    are retried up to max_retries times with full-jitter exponential backoff,
+    or after the server's Retry-After delay when one is sent.
+
+    Only requests that are safe to replay are retried after they may have
+    reached the server: GET/HEAD/PUT/DELETE, PATCHes without +/- field
+    modifiers, record creates carrying a client-chosen ID (a replay fails
+    instead of duplicating) and batches made only of those. Anything else is
+    retried only on 429 or when the connection was never established.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.2,
+        backoff_max: float = 10.0,
+        retry_statuses: Sequence[int] = (429, 500, 502, 503, 504),
+        max_retry_after: float = 60.0
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.max_retry_after = max_retry_after
+
+    def is_idempotent(self, method: str, endpoint: str, body: Any = None) -> bool:
+        """Whether replaying the request cannot apply it twice."""
+        if method in self.IDEMPOTENT_METHODS:
+            return True
+        if method == 'PATCH':
+            return not any(k.startswith(('+', '-')) or k.endswith(('+', '-')) for k in (body or {}))
+        if method == 'POST' and endpoint == '/batch':
+            return all(
+                self.is_idempotent(r['method'], r['url'][len('/api'):], r.get('body'))
+                for r in body['requests']
+            )
+        match = _RECORD_ENDPOINT.match(endpoint)
+        return method == 'POST' and bool(match) and not match.group(2) and bool((body or {}).get('id'))
+
+    def next_delay(
+        self,
+        attempt: int,
+        method: str,
+        endpoint: str,
+        body: Any = None,
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None
+    ) -> Optional[float]:
+        """Seconds to wait before retry number attempt + 1, or None to give up."""
+        if attempt >= self.max_retries:
+            return None
+        if error is not None:
+            if not isinstance(error, _UNSENT_ERRORS) and not self.is_idempotent(method, endpoint, body):
+                return None
+        else:
+            status = response.status_code
+            if status not in self.retry_statuses:
+                return None
+            if status != 429 and not self.is_idempotent(method, endpoint, body):
+                return None
+            retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+DEFAULT_RETRY = RetryPolicy()
+
+
+def _is_auth_endpoint(endpoint: str) -> bool:
+    return endpoint.endswith(('/auth-with-password', '/auth-refresh'))
@@ -0,0 +1,241 @@
+"""
+Record types and collection names for the CRM-Tableturnerr PocketBase schema.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Any, TypedDict
+
+
+class User(TypedDict, total=False):
+    id: str
+    name: str
+    email: str
+    role: str  # 'admin' | 'operator' | 'member'
+    status: str  # 'online' | 'offline' | 'suspended'
+    last_activity: Optional[str]
+    created: str
+    updated: str
+
+
+class Company(TypedDict, total=False):
+    id: str
+    company_name: str
+    owner_name: Optional[str]
+    company_location: Optional[str]
+    google_maps_link: Optional[str]
+    phone_numbers: Optional[str]
+    source: str  # 'cold_call' | 'manual'
+    created: str
+    updated: str
+
+
+class ColdCallExpand(TypedDict, total=False):
+    company: Company
+    claimed_by: User
+
+
+class ColdCall(TypedDict, total=False):
+    id: str
+    company: Optional[str]  # Relation ID
+    caller_name: Optional[str]
+    recipients: Optional[str]
+    call_outcome: Optional[str]
+    interest_level: Optional[int]
+    objections: Optional[List[str]]
+    pain_points: Optional[List[str]]
+    follow_up_actions: Optional[List[str]]
+    call_summary: Optional[str]
+    call_duration_estimate: Optional[str]
+    model_used: Optional[str]
+    phone_number: Optional[str]
+    owner_name: Optional[str]
+    claimed_by: Optional[str]
+    created: str
+    updated: str
+    expand: ColdCallExpand
+
+
+class CallTranscriptExpand(TypedDict, total=False):
+    call: ColdCall
+
+
+class CallTranscript(TypedDict, total=False):
+    id: str
+    call: str  # Relation ID to cold_calls
+    transcript: str
+    created: str
+    expand: CallTranscriptExpand
+
+
+class Lead(TypedDict, total=False):
+    id: str
+    username: str
+    status: str
+    first_contacted: Optional[str]
+    last_updated: Optional[str]
+    notes: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+    contact_source: Optional[str]
+    source: str  # 'instagram' | 'cold_call'
+    created: str
+    updated: str
+
+
+class InstaActorExpand(TypedDict, total=False):
+    owner: User
+
+
+class InstaActor(TypedDict, total=False):
+    id: str
+    username: str
+    owner: Optional[str]  # Relation ID to users
+    status: str  # 'Active' | 'Suspended By Team' | 'Suspended By Insta' | 'Discarded'
+    last_activity: Optional[str]
+    created: str
+    updated: str
+    expand: InstaActorExpand
+
+
+class EventLogExpand(TypedDict, total=False):
+    actor: InstaActor
+    user: User
+    target: Lead
+    cold_call: ColdCall
+
+
+class EventLog(TypedDict, total=False):
+    id: str
+    event_type: str
+    actor: Optional[str]
+    user: Optional[str]
+    target: Optional[str]
+    cold_call: Optional[str]
+    details: Optional[str]
+    source: str  # 'instagram' | 'cold_call'
+    created: str
+    expand: EventLogExpand
+
+
+class OutreachLogExpand(TypedDict, total=False):
+    event: EventLog
+
+
+class OutreachLog(TypedDict, total=False):
+    id: str
+    event: str  # Relation ID
+    message_text: Optional[str]
+    sent_at: Optional[str]
+    created: str
+    expand: OutreachLogExpand
+
+
+class AssignmentExpand(TypedDict, total=False):
+    assigned_to_user: User
+    assigned_to_actor: InstaActor
+    suggested_by: User
+
+
+class Goal(TypedDict, total=False):
+    id: str
+    metric: str
+    target_value: int
+    frequency: str
+    assigned_to_user: Optional[str]
+    assigned_to_actor: Optional[str]
+    status: str
+    suggested_by: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    created: str
+    expand: AssignmentExpand
+
+
+class Rule(TypedDict, total=False):
+    id: str
+    type: str
+    metric: str
+    limit_value: int
+    time_window_sec: int
+    severity: Optional[str]
+    assigned_to_user: Optional[str]
+    assigned_to_actor: Optional[str]
+    status: str
+    suggested_by: Optional[str]
+    created: str
+    expand: AssignmentExpand
+
+
+
+# Slotted counterparts of the hot TypedDicts above, for bulk reads where
+# per-record dict overhead matters (see JSONDecoder.decode_items). Missing
+# fields are None; fields PocketBase returns that are not listed are dropped.
+
+@dataclass(slots=True)
+class ColdCallStruct:
+    id: str = ''
+    company: Optional[str] = None
+    caller_name: Optional[str] = None
+    recipients: Optional[str] = None
+    call_outcome: Optional[str] = None
+    interest_level: Optional[float] = None  # number field without onlyInt
+    # json fields: normally lists of strings, but any JSON value is accepted
+    objections: Any = None
+    pain_points: Any = None
+    follow_up_actions: Any = None
+    call_summary: Optional[str] = None
+    call_duration_estimate: Optional[str] = None
+    model_used: Optional[str] = None
+    phone_number: Optional[str] = None
+    owner_name: Optional[str] = None
+    claimed_by: Optional[str] = None
+    created: Optional[str] = None
+    updated: Optional[str] = None
+    expand: Optional[Dict[str, Any]] = None
+
+
+@dataclass(slots=True)
+class LeadStruct:
+    id: str = ''
+    username: Optional[str] = None
+    status: Optional[str] = None
+    first_contacted: Optional[str] = None
+    last_updated: Optional[str] = None
+    notes: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    contact_source: Optional[str] = None
+    source: Optional[str] = None
+    created: Optional[str] = None
+    updated: Optional[str] = None
+
+
+@dataclass(slots=True)
+class EventLogStruct:
+    id: str = ''
+    event_type: Optional[str] = None
+    actor: Optional[str] = None
+    user: Optional[str] = None
+    target: Optional[str] = None
+    cold_call: Optional[str] = None
+    details: Optional[str] = None
+    source: Optional[str] = None
+    created: Optional[str] = None
+    updated: Optional[str] = None
+    expand: Optional[Dict[str, Any]] = None
+
+
+COLLECTIONS = {
+    'USERS': 'users',
+    'COMPANIES': 'companies',
+    'LEADS': 'leads',
+    'INSTA_ACTORS': 'insta_actors',
+    'COLD_CALLS': 'cold_calls',
+    'CALL_TRANSCRIPTS': 'call_transcripts',
+    'EVENT_LOGS': 'event_logs',
+    'OUTREACH_LOGS': 'outreach_logs',
+    'GOALS': 'goals',
+    'RULES': 'rules',
+    'ALERTS': 'alerts',
+    'NOTES': 'notes',
+}
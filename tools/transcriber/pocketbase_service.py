@@ -1,17 +1,13 @@
 """
 CRM-Tableturnerr PocketBase Service
 
-Thin wrapper that imports from the shared SDK in packages/pocketbase-client.
-This allows the transcriber to use the same client as other Python apps.
+Thin wrapper around the shared SDK in packages/pocketbase-client (installed
+from requirements.txt). This allows the transcriber to use the same client as
+other Python apps.
 """
 
 import os
-import sys
-from pathlib import Path
-
-# Add the shared SDK to path
-SDK_PATH = Path(__file__).parent.parent.parent / "packages" / "pocketbase-client" / "src" / "python"
-sys.path.insert(0, str(SDK_PATH))
+from typing import Optional
 
 # Re-export from shared SDK
 from pocketbase_client import (
@@ -30,13 +26,25 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+# Authenticated client reused across calls in this process
+_client: Optional[CRMPocketBase] = None
+
+
 def get_authenticated_client() -> CRMPocketBase:
     """
-    Create and authenticate a PocketBase client using environment variables.
+    Get an authenticated PocketBase client using environment variables.
+    
+    The client is created once per process on the shared connection pool, so
+    processing several audio files reuses the same warm connections and admin
+    token. Calling close() on it is harmless.
     
     Returns:
         CRMPocketBase: Authenticated client ready for API calls.
     """
+    global _client
+    if _client is not None and _client.is_authenticated:
+        return _client
+
     url = os.getenv('POCKETBASE_URL', 'http://localhost:8090')
     email = os.getenv('PB_ADMIN_EMAIL')
     password = os.getenv('PB_ADMIN_PASSWORD')
@@ -47,8 +55,9 @@ def get_authenticated_client() -> CRMPocketBase:
             "or .env file"
         )
     
-    client = create_client(url)
+    client = create_client(url, shared=True)
     client.auth_as_admin(email, password)
+    _client = client
     return client
 
 
@@ -138,14 +147,14 @@ def create_cold_call_with_transcript(
         'owner_name': analysis.get('owner_name', ''),
     }
     
-    cold_call = client.create_cold_call(call_data)
-    
-    # Create transcript record linked to the call
-    transcript_data = {
-        'call': cold_call['id'],
-        'transcript': transcript_text,
-    }
-    
-    transcript = client.create_transcript(transcript_data)
-    
+    # Create both records in one batch request; the transcript links to the
+    # call through the ID reserved by batch.create()
+    with client.batch() as batch:
+        call_id = batch.create(COLLECTIONS['COLD_CALLS'], call_data)
+        batch.create(COLLECTIONS['CALL_TRANSCRIPTS'], {
+            'call': call_id,
+            'transcript': transcript_text,
+        })
+
+    cold_call, transcript = batch.results
     return cold_call, transcript